@@ -13,6 +13,9 @@ class Config:
     # Secrets
     # ----------------------------
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    # Shared secret for internal/service-to-service endpoints (X-API-Key header);
+    # those endpoints are disabled while it is unset
+    SERVICE_API_KEY = os.getenv("SERVICE_API_KEY")
 
     # ----------------------------
     # Database / SQLAlchemy
@@ -45,4 +48,39 @@ class Config:
     QDRANT_PORT = os.getenv("QDRANT_PORT")
     QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
     QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME")
-    
\ No newline at end of file
+
+    # ----------------------------
+    # Products
+    # ----------------------------
+    # Listing totals per (search, category) are cached this many seconds
+    PRODUCT_TOTALS_CACHE_TTL = float(os.getenv("PRODUCT_TOTALS_CACHE_TTL", 30))
+    PRODUCT_TOTALS_CACHE_SIZE = int(os.getenv("PRODUCT_TOTALS_CACHE_SIZE", 1024))
+    # Per-process read-through cache of serialized products (get_product / get_products_by_ids)
+    PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", 10000))
+    PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", 300))
+    # Seconds the catalog version (behind listing ETags) is reused before re-reading it
+    CATALOG_VERSION_TTL = float(os.getenv("CATALOG_VERSION_TTL", 5))
+    # Cache-Control max-age for anonymous listings / product detail (0 = always revalidate)
+    PRODUCT_LISTING_MAX_AGE = int(os.getenv("PRODUCT_LISTING_MAX_AGE", 30))
+    PRODUCT_DETAIL_MAX_AGE = int(os.getenv("PRODUCT_DETAIL_MAX_AGE", 60))
+    # Default product search: "ilike" (substring match, the historical behaviour),
+    # "fulltext" (tsvector + trigram, ranked; matches whole stemmed words and
+    # similar names, not arbitrary substrings) or "index" (in-memory prefix
+    # search, see CATALOG_INDEX_ENABLED). "fulltext" needs the migration job.
+    PRODUCT_SEARCH_MODE = os.getenv("PRODUCT_SEARCH_MODE", "ilike")
+    # In-process catalog index answering "index" mode searches without Postgres
+    CATALOG_INDEX_ENABLED = os.getenv("CATALOG_INDEX_ENABLED", "False") == "True"
+    # Seconds between polls for products updated in other processes
+    CATALOG_INDEX_REFRESH_INTERVAL = int(os.getenv("CATALOG_INDEX_REFRESH_INTERVAL", 60))
+
+    # ----------------------------
+    # Recommendations
+    # ----------------------------
+    # Materialized rows older than this (seconds) are recomputed live
+    RECOMMENDATION_TABLE_MAX_AGE = int(os.getenv("RECOMMENDATION_TABLE_MAX_AGE", 86400))
+    # Seconds between polls for users whose vectors the activity updater changed
+    RECOMMENDATION_INVALIDATION_INTERVAL = float(os.getenv("RECOMMENDATION_INVALIDATION_INTERVAL", 5))
+    # Seconds between change checks of the cold-start popularity ranking
+    POPULARITY_REFRESH_INTERVAL = int(os.getenv("POPULARITY_REFRESH_INTERVAL", 300))
+    # Seconds between refreshes of the "similar products" co-occurrence index
+    COOCCURRENCE_REFRESH_INTERVAL = int(os.getenv("COOCCURRENCE_REFRESH_INTERVAL", 300))
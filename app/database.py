@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.schema import CreateColumn, CreateIndex
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.config import Config
 
@@ -43,15 +44,54 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, futu
 class Base(DeclarativeBase):
     pass
 
+# Schema changes below are run by the migration job (app.jobs.migrate), never at start-up
+
+def ensure_extensions():
+    """Enable the Postgres extensions the models rely on (pg_trgm for trigram search)."""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+def ensure_indexes():
+    """
+    Create indexes declared on models whose tables already exist
+    (create_all only builds indexes together with new tables). Generated
+    columns missing from existing tables are added first, since they are
+    what the search indexes are built on; adding one rewrites the table
+    under an exclusive lock.
+
+    Indexes are built CONCURRENTLY so reads and writes continue meanwhile;
+    an invalid index left behind by an interrupted build is rebuilt.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.computed is not None and column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid = set(conn.execute(text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid"
+        )).scalars())
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in invalid:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+                index.dialect_options["postgresql"]["concurrently"] = True
+                try:
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+                finally:
+                    index.dialect_options["postgresql"]["concurrently"] = False
+
 def get_session():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
-
-# -------------------------------
-# 3️⃣ Create all tables
-# -------------------------------
-Base.metadata.create_all(engine)
-print("All tables created successfully!")
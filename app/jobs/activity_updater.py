@@ -0,0 +1,76 @@
+"""
+Streaming updater that keeps user sparse vectors in sync with activity.
+
+Reads the activity events that track_activity publishes (SNS -> SQS),
+merges them per user in micro-batches and upserts the changed vectors.
+
+CLI (long-running consumer):
+    python -m app.jobs.activity_updater --batch-size 100
+
+Lambda (SQS event source mapping, with ReportBatchItemFailures enabled):
+    handler "app.jobs.activity_updater.lambda_handler"
+
+Use a FIFO topic/queue so one user's events are never applied concurrently
+(track_activity sets MessageGroupId = user_id on FIFO topics). Each batch
+holds the vector write lock, which app.jobs.compact_vectors takes as well.
+"""
+import argparse
+from app.config import Config
+from app.services.recommendation import mark_recommendations_stale
+from app.services.vector_lock import vector_write_lock
+from src.messaging.sqs import SQSActivitySource, parse_activity_message
+from src.recommender.registry import get_sparse_client
+from src.vectorstore.maintenance import VectorMaintenance
+from src.vectorstore.updater import ActivityVectorUpdater
+
+
+def build_updater():
+    return ActivityVectorUpdater(
+        get_sparse_client(),
+        maintenance=VectorMaintenance.from_env(),
+        # Web workers drop their cached recommendations once the new vector is stored
+        on_written=mark_recommendations_stale,
+        # Serialises batches with compaction passes (app.jobs.compact_vectors)
+        lock=vector_write_lock
+    )
+
+
+def lambda_handler(event, context):
+    """
+    Apply one SQS-triggered batch. Messages of users whose vector could not
+    be written are returned as batchItemFailures so only they are redelivered;
+    already-applied activities are skipped on redelivery.
+    """
+    messages = []
+    for record in (event or {}).get("Records", []):
+        activity = parse_activity_message(record.get("body"))
+        if activity:
+            messages.append((record.get("messageId"), activity))
+
+    result = build_updater().apply(activity for _, activity in messages)
+    failures = [
+        {"itemIdentifier": message_id}
+        for message_id, activity in messages
+        if str(activity.get("user_id")) in result.failed_users
+    ]
+    return {"batchItemFailures": failures, "updated_users": result.written}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream activity events into user vectors.")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--wait-seconds", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    source = SQSActivitySource(
+        sqs_queue_arn=Config.AWS_SQS_QUEUE_ARN,
+        aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+        region_name=Config.AWS_REGION,
+        endpoint_url=Config.AWS_ENDPOINT_URL,
+    )
+    build_updater().run(source, batch_size=args.batch_size, wait_seconds=args.wait_seconds)
+
+
+if __name__ == "__main__":
+    main()
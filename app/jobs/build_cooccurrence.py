@@ -0,0 +1,43 @@
+"""
+Publisher for the "similar products" co-occurrence index.
+
+Keeps the item-to-item counts in this one process, refreshes them
+incrementally from orders and cart items, and publishes the top-M neighbour
+arrays under COOCCURRENCE_PATH. Web workers started with the same
+COOCCURRENCE_PATH memory-map the latest version instead of building their own.
+
+CLI:
+    COOCCURRENCE_PATH=/var/lib/ba/cooccurrence python -m app.jobs.build_cooccurrence --interval 300
+"""
+import argparse
+import os
+import time
+from app.services.cooccurrence import load_interactions
+from src.recommender.cooccurrence import CooccurrenceEngine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and publish the co-occurrence index.")
+    parser.add_argument("--path", default=os.getenv("COOCCURRENCE_PATH"))
+    parser.add_argument("--max-neighbours", type=int, default=int(os.getenv("COOCCURRENCE_MAX_NEIGHBOURS", 20)))
+    parser.add_argument("--interval", type=float, default=0, help="Seconds between refreshes; 0 builds once")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("--path or COOCCURRENCE_PATH is required")
+
+    os.makedirs(args.path, exist_ok=True)
+    engine = CooccurrenceEngine(loader=load_interactions, max_neighbours=args.max_neighbours, path=args.path)
+    while True:
+        started = time.perf_counter()
+        engine.refresh()
+        print(
+            f"Co-occurrence index {engine.index.version or '(unchanged)'}: {len(engine.index)} products "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        if args.interval <= 0:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
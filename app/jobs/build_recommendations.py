@@ -0,0 +1,130 @@
+"""
+Offline builder for the `user_recommendations` table.
+
+Walks the Qdrant collection with `scroll`, computes every user's top-K in
+parallel worker processes and bulk-upserts the results into Postgres.
+
+CLI:
+    python -m app.jobs.build_recommendations --top-k-similar-users 5 --top-k-items 10
+
+Lambda:
+    handler "app.jobs.build_recommendations.lambda_handler", event keys mirror
+    the CLI options (top_k_similar_users, top_k_items, page_size, workers).
+"""
+import argparse
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import app.models  # ensures all models are loaded
+from app.jobs.migrate import migrate
+from app.services.recommendation import save_recommendations_bulk
+from src.recommender import registry
+from src.recommender.recommender import SparseRecommender
+from src.vectorstore.store import SparseClient
+
+logger = logging.getLogger(__name__)
+
+# Per-process recommender, built once in each worker
+_worker_recommender = None
+
+
+def _init_worker(top_k_similar_users, top_k_items):
+    global _worker_recommender
+    registry.reset()  # never reuse a connection inherited across fork
+    _worker_recommender = SparseRecommender(
+        top_k_similar_users=top_k_similar_users,
+        top_k_items=top_k_items,
+        client=registry.get_sparse_client()
+    )
+
+
+def _compute_page(points):
+    return _worker_recommender.recommend_for_points(points)
+
+
+def _compute_pages(pages, workers, top_k_similar_users, top_k_items):
+    """
+    Yield per-page results in order, keeping at most 2 * workers pages in flight
+    so the scroll is never read ahead into memory.
+    """
+    if workers <= 1:
+        # Inline mode (e.g. Lambda, which lacks the shared memory multiprocessing needs)
+        _init_worker(top_k_similar_users, top_k_items)
+        for page in pages:
+            yield _compute_page(page)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(top_k_similar_users, top_k_items),
+    ) as pool:
+        in_flight = deque()
+        for page in pages:
+            in_flight.append(pool.submit(_compute_page, page))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def build_recommendations(top_k_similar_users=5, top_k_items=10, page_size=256, workers=None):
+    """
+    Recompute and store recommendations for every user in the collection.
+    Returns the number of rows written.
+    """
+    # Idempotent and lock-guarded; also enables pg_trgm, which the product
+    # indexes need before create_all can succeed on a fresh database
+    migrate()
+
+    workers = workers or os.cpu_count() or 1
+    computed_at = datetime.utcnow()
+    client = SparseClient()
+    written = 0
+
+    pages = client.scroll_points(page_size=page_size)
+    for recommendations in _compute_pages(pages, workers, top_k_similar_users, top_k_items):
+        written += save_recommendations_bulk(
+            recommendations,
+            top_k_similar_users=top_k_similar_users,
+            top_k_items=top_k_items,
+            computed_at=computed_at,
+        )
+        logger.info(f"Stored recommendations for {written} users")
+
+    return written
+
+
+def lambda_handler(event, context):
+    event = event or {}
+    written = build_recommendations(
+        top_k_similar_users=int(event.get("top_k_similar_users", 5)),
+        top_k_items=int(event.get("top_k_items", 10)),
+        page_size=int(event.get("page_size", 256)),
+        workers=int(event.get("workers", 1)),
+    )
+    return {"statusCode": 200, "written": written}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the user_recommendations table.")
+    parser.add_argument("--top-k-similar-users", type=int, default=5)
+    parser.add_argument("--top-k-items", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    written = build_recommendations(
+        top_k_similar_users=args.top_k_similar_users,
+        top_k_items=args.top_k_items,
+        page_size=args.page_size,
+        workers=args.workers,
+    )
+    print(f"Stored recommendations for {written} users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Offline compaction of the user vectors: decays and prunes every point of the
+collection (see VectorMaintenance).
+
+Safe to run next to the activity updater: both hold the vector write lock
+(app.services.vector_lock) around their read-modify-write steps.
+
+CLI:
+    VECTOR_DECAY_HALF_LIFE_DAYS=30 VECTOR_MAX_ENTRIES=200 python -m app.jobs.compact_vectors --workers 4
+"""
+import argparse
+import os
+import sys
+from app.services.vector_lock import vector_write_lock
+from src.vectorstore.maintenance import VectorMaintenance
+from src.vectorstore.store import SparseClient
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decay and prune every user vector.")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("VECTOR_COMPACT_WORKERS", 4)))
+    parser.add_argument("--page-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    maintenance = VectorMaintenance.from_env()
+    if maintenance is None:
+        parser.error("Set VECTOR_DECAY_HALF_LIFE_DAYS and/or VECTOR_MAX_ENTRIES")
+    report = maintenance.compact(
+        SparseClient(),
+        page_size=args.page_size,
+        max_workers=args.workers,
+        lock=vector_write_lock
+    )
+    print(f"Compacted {report.inserted} points in {report.batches} batches, {len(report.failed)} failed")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Bulk product import.
+
+Reads NDJSON (one create_product-style object per line) or CSV with the same
+field names, streaming the file, and upserts it in multi-row batches keyed on
+product_id. Bad rows are reported and skipped; the rest are imported.
+
+CLI:
+    python -m app.jobs.import_products products.ndjson --batch-size 1000
+    python -m app.jobs.import_products - --format csv < products.csv
+"""
+import argparse
+import io
+import json
+import sys
+import time
+from app.services.product_import import import_products, parse_products
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import products from NDJSON or CSV.")
+    parser.add_argument("path", help="File to import, or '-' for stdin")
+    parser.add_argument("--format", choices=("ndjson", "csv"), help="Defaults to csv for *.csv files, else ndjson")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--user-id", default=None, help="Recorded on the CREATE_PRODUCT / UPDATE_PRODUCT events")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    if args.path == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    else:
+        stream = open(args.path, encoding="utf-8", newline="")
+
+    started = time.perf_counter()
+    with stream:
+        report = import_products(parse_products(stream, fmt), user_id=args.user_id, batch_size=args.batch_size)
+    print(
+        f"Imported {report['imported']} products, {report['failed']} failed "
+        f"in {time.perf_counter() - started:.1f} s"
+    )
+    for error in report["errors"]:
+        print(json.dumps(error))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
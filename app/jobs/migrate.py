@@ -0,0 +1,76 @@
+"""
+One-off schema migration: enables the Postgres extensions the models need
+(pg_trgm), creates missing tables, adds generated columns and builds the
+indexes declared on existing tables.
+
+Run it once per deploy, before the web workers / Lambda start; the app
+itself no longer issues DDL at start-up. Concurrent runs are serialised
+with a Postgres advisory lock, so it is safe to start it from several
+places at once.
+
+CLI:
+    python -m app.jobs.migrate
+    # Migrate, then verify that every table, column and valid index exists
+    python -m app.jobs.migrate --check
+
+Lambda:
+    invoke the API function with {"job": "migrate"}; the deploy workflow
+    does this after updating the function code
+"""
+import argparse
+import sys
+from sqlalchemy import inspect, text
+from app.database import Base, engine, ensure_extensions, ensure_indexes
+import app.models  # registers every model on Base.metadata
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 0x62615f6d6967
+
+
+def migrate():
+    # Session-level lock on an autocommit connection: an open transaction here
+    # would block the CREATE INDEX CONCURRENTLY builds forever
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            ensure_extensions()
+            Base.metadata.create_all(engine)
+            ensure_indexes()
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+
+def check():
+    """Return a list of problems: missing tables, columns or valid indexes."""
+    problems = []
+    inspector = inspect(engine)
+    with engine.connect() as conn:
+        valid = set(conn.execute(text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indisvalid"
+        )).scalars())
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"missing table {table.name}")
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        problems += [f"missing column {table.name}.{c.name}" for c in table.columns if c.name not in existing]
+        problems += [f"missing or invalid index {index.name}" for index in table.indexes if index.name not in valid]
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create missing tables and indexes.")
+    parser.add_argument("--check", action="store_true", help="Verify the schema afterwards")
+    args = parser.parse_args(argv)
+    migrate()
+    print("Schema is up to date")
+    if args.check:
+        problems = check()
+        for problem in problems:
+            print(problem)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
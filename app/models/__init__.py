@@ -2,3 +2,4 @@ from .user import User
 from .product import Product
 from .cart import CartItem
 from .order import Order
+from .recommendation import UserRecommendation, RecommendationInvalidation
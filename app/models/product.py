@@ -1,11 +1,29 @@
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import String, DateTime, Float, Integer
+from sqlalchemy import String, DateTime, Float, Integer, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination: newest first, product_id breaks created_at ties
+        Index("ix_products_created_at_product_id", "created_at", "product_id"),
+        # Catalog version (MAX(updated_at)) and incremental loads by updated_at
+        Index("ix_products_updated_at", "updated_at"),
+        # Full-text search over the generated search_vector column
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes (pg_trgm): fuzzy name matches and ILIKE '%q%' substring search
+        Index(
+            "ix_products_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_products_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+        ),
+    )
 
     product_id: Mapped[int] = mapped_column(Integer, primary_key=True, auto_increment=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -16,19 +34,45 @@ class Product(Base):
     category: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Maintained by Postgres on every insert/update; name terms rank above description terms
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Relationship
     cart_items: Mapped[list["CartItem"]] = relationship("CartItem", back_populates="product", cascade="all, delete-orphan")
 
     def to_dict(self):
+        return Product.row_to_dict(self)
+
+    # ----------------------------
+    # ORM-free read path
+    # ----------------------------
+    @classmethod
+    def columns(cls):
+        """Columns needed by row_to_dict; select these to get plain rows instead of entities."""
+        return (
+            cls.product_id, cls.name, cls.description, cls.price, cls.image,
+            cls.type, cls.category, cls.created_at, cls.updated_at,
+        )
+
+    @staticmethod
+    def row_to_dict(row):
+        """Serialize a Product or a row selected with Product.columns()."""
         return {
-            "id": self.product_id,
-            "name": self.name,
-            "description": self.description,
-            "price": float(self.price),
-            "image": self.image,
-            "type": self.type,
-            "category": self.category,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "id": row.product_id,
+            "name": row.name,
+            "description": row.description,
+            "price": float(row.price),
+            "image": row.image,
+            "type": row.type,
+            "category": row.category,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
         }
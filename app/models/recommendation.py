@@ -0,0 +1,45 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class UserRecommendation(Base):
+    """Precomputed top-K recommendations, written by app.jobs.build_recommendations."""
+    __tablename__ = "user_recommendations"
+
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    top_k_similar_users: Mapped[int] = mapped_column(Integer, primary_key=True)
+    top_k_items: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # [[product_id, score], ...] sorted by score descending
+    items: Mapped[list] = mapped_column(JSON, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "top_k_similar_users": self.top_k_similar_users,
+            "top_k_items": self.top_k_items,
+            "items": self.items,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None
+        }
+
+
+class RecommendationInvalidation(Base):
+    """
+    When a user's sparse vector last changed, written by the activity updater
+    after its upserts. Web workers poll it to drop stale cached recommendations.
+    """
+    __tablename__ = "recommendation_invalidations"
+
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Database clock in UTC, so writers and pollers on different hosts agree
+    # and it compares with the UTC computed_at of UserRecommendation
+    invalidated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.timezone("UTC", func.now()), index=True
+    )
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "invalidated_at": self.invalidated_at.isoformat() if self.invalidated_at else None
+        }
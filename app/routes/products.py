@@ -1,21 +1,36 @@
 # app/routes/products.py
+import io
+import json
 import requests
 from sqlalchemy import or_
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from app.config import Config
 from app.database import get_session
 from app.models import Product
 from app.services.activity import track_activity
+from app.services.cooccurrence import get_similar_products
 from app.services.product import (
+    count_products,
     create_product,
+    get_catalog_version,
     get_product,
     get_products,
     get_products_by_ids,
+    stream_products,
 )
 from app.utils.decorators import verify_token as decode_token  # helper to decode token if present
+from app.utils.decorators import service_key_required
+from app.utils.http_cache import (
+    make_etag,
+    not_modified,
+    public_cache_control,
+    request_etag_matches,
+    with_cache_headers,
+)
 
-# Import the recommender system
-from src.recommender.recommender import SparseRecommender
+# Materialized-first recommendations with live fallback
+from app.services.recommendation import get_user_recommendations
+from app.services.product_import import import_products, parse_products
 
 products_bp = Blueprint("products", __name__)
 
@@ -30,6 +45,10 @@ def get_products_route():
         per_page = int(request.args.get("per_page", 6))
         search_query = request.args.get("q")
         category = request.args.get("category")
+        # "ilike", "fulltext" (ranked) or "index"; defaults to Config.PRODUCT_SEARCH_MODE
+        search_mode = request.args.get("search_mode")
+        # Keyset mode when present ("" for the first page); see get_products
+        cursor = request.args.get("cursor")
 
         recommended_products = []
         recommended_ids = []
@@ -37,6 +56,14 @@ def get_products_route():
         # Optional Authorization header
         auth_header = request.headers.get("Authorization")
 
+        # Anonymous listings depend only on the query string and the catalog
+        # version, so a client holding the current ETag gets a bodiless 304
+        etag = None
+        if not (auth_header and auth_header.startswith("Bearer ")):
+            etag = make_etag("products", get_catalog_version(), sorted(request.args.items(multi=True)))
+            if request_etag_matches(etag):
+                return not_modified(etag, public_cache_control(Config.PRODUCT_LISTING_MAX_AGE))
+
         # --------------------------------
         # STEP 1: Get recommended products
         # --------------------------------
@@ -48,11 +75,10 @@ def get_products_route():
                 if current_user:
                     user_id = current_user.get("user_id")
 
-                    # Initialize recommender system
-                    recommender = SparseRecommender(top_k_similar_users=5, top_k_items=10)
-
                     # Get recommended item indices (product IDs)
-                    recommendations = recommender.recommend(user_id)
+                    recommendations = get_user_recommendations(
+                        user_id, top_k_similar_users=5, top_k_items=10
+                    )
 
                     # recommendations is a list of tuples: [(index, score), ...]
                     recommended_ids = [idx for idx, _ in recommendations]
@@ -78,6 +104,8 @@ def get_products_route():
         # --------------------------------
         remaining_slots = per_page - len(recommended_products)
         regular_products = []
+        regular_result = None
+        next_cursor = cursor
         if remaining_slots > 0:
             regular_result = get_products(
                 page=page,
@@ -85,33 +113,52 @@ def get_products_route():
                 search_query=search_query,
                 category=category,
                 exclude_ids=recommended_ids,
+                cursor=cursor,
+                search_mode=search_mode,
             )
             regular_products = regular_result["products"]
+            next_cursor = regular_result.get("next_cursor")
 
         # --------------------------------
         # STEP 3: Merge and paginate
         # --------------------------------
         paginated_products = recommended_products[:per_page] + regular_products
 
-        # Compute total items and pages
-        total_items_result = get_products(
-            page=1, per_page=1, search_query=search_query, category=category
-        )
-        total_items = total_items_result["total_items"]
-        total_pages = (total_items + per_page - 1) // per_page
-
-        return (
-            jsonify(
+        if cursor is not None:
+            response = jsonify(
                 {
                     "products": paginated_products,
-                    "total_pages": total_pages,
-                    "current_page": page,
-                    "total_items": total_items,
+                    "next_cursor": next_cursor,
+                    "per_page": per_page,
                 }
-            ),
-            200,
+            )
+            if etag is not None:
+                response = with_cache_headers(response, etag, public_cache_control(Config.PRODUCT_LISTING_MAX_AGE))
+            return response, 200
+
+        # Total items comes with the page (or from the totals cache)
+        if regular_result is not None:
+            total_items = regular_result["total_items"]
+        else:
+            total_items = count_products(
+                search_query=search_query, category=category, search_mode=search_mode
+            )
+        total_pages = (total_items + per_page - 1) // per_page
+
+        response = jsonify(
+            {
+                "products": paginated_products,
+                "total_pages": total_pages,
+                "current_page": page,
+                "total_items": total_items,
+            }
         )
+        if etag is not None:
+            response = with_cache_headers(response, etag, public_cache_control(Config.PRODUCT_LISTING_MAX_AGE))
+        return response, 200
 
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         print(f"Error in get_products_route: {e}")
         return jsonify({"message": str(e)}), 500
@@ -126,22 +173,63 @@ def get_product_route(product_id):
 
         # Optional activity tracking if token is present
         auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
+        authenticated = auth_header and auth_header.startswith("Bearer ")
+        if authenticated:
             token = auth_header.split(" ")[1]
             current_user = decode_token(token)
             if current_user:
                 track_activity(current_user["user_id"], "VIEW", product_id)
 
-        return (
-            jsonify(product.to_dict() if hasattr(product, "to_dict") else product),
-            200,
+        # Signed-in views must keep reaching the server so they are tracked
+        cache_control = (
+            "private, no-cache" if authenticated
+            else public_cache_control(Config.PRODUCT_DETAIL_MAX_AGE)
         )
+        etag = make_etag("product", product["id"], product["updated_at"])
+        if request_etag_matches(etag):
+            return not_modified(etag, cache_control)
+
+        response = jsonify(product)
+        return with_cache_headers(response, etag, cache_control), 200
 
     except Exception as e:
         print(f"Error in get_product_route: {e}")
         return jsonify({"message": str(e)}), 500
 
 
+@products_bp.route("/products/<int:product_id>/similar", methods=["GET"])
+def similar_products_route(product_id):
+    """
+    Products most often bought or carted together with this one, served
+    from the co-occurrence index published by app.jobs.build_cooccurrence
+    (an empty list when COOCCURRENCE_PATH is not configured).
+
+    Query params:
+        k: number of products (default 10, at most 100)
+        include_products: "true" to attach product details (one DB query)
+    """
+    try:
+        k = min(int(request.args.get("k", 10)), 100)
+        include_products = request.args.get("include_products", "false").lower() == "true"
+
+        similar = get_similar_products(product_id, k)
+
+        items = [{"id": idx, "score": score} for idx, score in similar]
+        if include_products and similar:
+            products_by_id = {p["id"]: p for p in get_products_by_ids([idx for idx, _ in similar])}
+            items = [
+                {**products_by_id[idx], "score": score}
+                for idx, score in similar
+                if idx in products_by_id
+            ]
+
+        return jsonify({"product_id": product_id, "similar_products": items}), 200
+
+    except Exception as e:
+        print(f"Error in similar_products_route: {e}")
+        return jsonify({"message": str(e)}), 500
+
+
 @products_bp.route("/products/create", methods=["POST"])
 def create_product_route():
     try:
@@ -151,6 +239,88 @@ def create_product_route():
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
+@products_bp.route("/products/bulk", methods=["POST"])
+@service_key_required
+def bulk_create_products_route():
+    """
+    Create or update many products in one call.
+    Internal endpoint: requires the X-API-Key service credential, since it
+    overwrites existing products matched by id.
+
+    Body (streamed, never loaded whole):
+        - NDJSON (default): one create_product-style object per line
+        - CSV (Content-Type text/csv or ?format=csv): header row with the same fields
+        - JSON array (Content-Type application/json)
+    Query params:
+        batch_size: rows per INSERT batch (default 1000)
+        user_id: recorded on the CREATE_PRODUCT / UPDATE_PRODUCT events (optional)
+
+    Rows that fail validation or the insert are reported individually;
+    the rest of the import continues.
+    """
+    try:
+        batch_size = max(1, min(request.args.get("batch_size", 1000, type=int), 10000))
+        user_id = request.args.get("user_id")
+
+        if request.mimetype == "application/json":
+            data = request.get_json()
+            if not isinstance(data, list):
+                return jsonify({"message": "Expected a JSON array of products"}), 400
+            rows = (
+                (i, item if isinstance(item, dict) else ValueError("Expected a JSON object"))
+                for i, item in enumerate(data, start=1)
+            )
+        else:
+            fmt = request.args.get("format") or ("csv" if request.mimetype == "text/csv" else "ndjson")
+            if fmt not in ("csv", "ndjson"):
+                return jsonify({"message": f"Unsupported format '{fmt}'"}), 400
+            stream = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+            rows = parse_products(stream, fmt)
+
+        report = import_products(rows, user_id=user_id, batch_size=batch_size)
+        return jsonify(report), 200
+
+    except Exception as e:
+        print(f"Error in bulk_create_products_route: {e}")
+        return jsonify({"message": str(e)}), 500
+
+@products_bp.route("/products/export", methods=["GET"])
+def export_products_route():
+    """
+    Stream the whole catalog as NDJSON, one product per line, in product_id order.
+
+    The last line is always a marker: {"done": true, "last_id": ...} after a
+    complete export, or {"error": "...", "last_id": ...} if the scan failed
+    part-way. A body without a marker was cut off; either way, resume with
+    after_id=<last_id>.
+
+    Query params:
+        after_id: resume after this product_id (the last one received)
+        batch_size: rows fetched per database round trip (default 1000)
+    """
+    try:
+        after_id = request.args.get("after_id", type=int)
+        batch_size = max(1, min(request.args.get("batch_size", 1000, type=int), 10000))
+
+        def generate():
+            last_id = after_id
+            try:
+                for product in stream_products(after_id=after_id, batch_size=batch_size):
+                    yield json.dumps(product) + "\n"
+                    last_id = product["id"]
+            except Exception as e:
+                # Headers are already sent, so report the failure in-band
+                print(f"Error in export_products_route stream: {e}")
+                yield json.dumps({"error": str(e), "last_id": last_id}) + "\n"
+                return
+            yield json.dumps({"done": True, "last_id": last_id}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    except Exception as e:
+        print(f"Error in export_products_route: {e}")
+        return jsonify({"message": str(e)}), 500
+
 @products_bp.route("/products/recommend", methods=["GET"])
 def recommend():
     """
@@ -176,8 +346,9 @@ def recommend():
         # -------------------------------
         # STEP 2: Get recommendations
         # -------------------------------
-        recommender = SparseRecommender(top_k_similar_users=10, top_k_items=10)
-        recommendations = recommender.recommend(user_id)
+        recommendations = get_user_recommendations(
+            user_id, top_k_similar_users=10, top_k_items=10
+        )
 
         if not recommendations:
             return jsonify({"message": "No recommendations found"}), 200
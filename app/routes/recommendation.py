@@ -0,0 +1,85 @@
+# app/routes/recommendation.py
+from flask import Blueprint, request, jsonify
+from app.services.product import get_products_by_ids
+from app.utils.decorators import service_key_required
+from src.recommender.registry import get_recommender
+
+recommendation_bp = Blueprint("recommendation", __name__)
+
+# Upper bound on users served by a single batch call
+MAX_BATCH_USERS = 1000
+
+# ------------------------
+# Routes
+# ------------------------
+
+@recommendation_bp.route("/recommendations/batch", methods=["POST"])
+@service_key_required
+def batch_recommendations_route():
+    """
+    Get recommendations for many users in one call.
+    Internal endpoint: requires the X-API-Key service credential, since it
+    returns other users' personalised results.
+
+    Body:
+        {
+            "user_ids": ["...", ...],
+            "top_k_similar_users": 5,     # optional, capped at RECOMMENDER_MAX_TOP_K_SIMILAR_USERS (50)
+            "top_k_items": 10,            # optional, capped at RECOMMENDER_MAX_TOP_K_ITEMS (100)
+            "include_products": false     # optional, attach product details
+        }
+    """
+    try:
+        data = request.get_json() or {}
+        user_ids = data.get("user_ids")
+        top_k_similar_users = int(data.get("top_k_similar_users", 5))
+        top_k_items = int(data.get("top_k_items", 10))
+        include_products = bool(data.get("include_products", False))
+
+        if not isinstance(user_ids, list) or not user_ids:
+            return jsonify({"message": "user_ids must be a non-empty list"}), 400
+        if len(user_ids) > MAX_BATCH_USERS:
+            return jsonify({"message": f"At most {MAX_BATCH_USERS} user_ids per call"}), 400
+
+        # -------------------------------
+        # STEP 1: Batch recommendations
+        # -------------------------------
+        recommender = get_recommender(top_k_similar_users=top_k_similar_users, top_k_items=top_k_items)
+        recommendations = recommender.recommend_many(user_ids)
+
+        # -------------------------------
+        # STEP 2: Optionally hydrate all products in one query
+        # -------------------------------
+        products_by_id = {}
+        if include_products:
+            all_ids = list(dict.fromkeys(idx for recs in recommendations.values() for idx, _ in recs))
+            products_by_id = {p["id"]: p for p in get_products_by_ids(all_ids)}
+
+        # -------------------------------
+        # STEP 3: Build response
+        # -------------------------------
+        response = {}
+        for user_id, recs in recommendations.items():
+            items = []
+            for idx, score in recs:
+                item = {"id": idx, "score": score}
+                if include_products:
+                    if idx not in products_by_id:
+                        continue
+                    item = {**products_by_id[idx], "score": score}
+                items.append(item)
+            response[user_id] = items
+
+        return (
+            jsonify(
+                {
+                    "total_users": len(response),
+                    "recommendations": response,
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        print(f"Error in /recommendations/batch: {e}")
+        return jsonify({"message": str(e)}), 500
@@ -30,6 +30,45 @@ def track_activity(user_id, activity_type, product_id=None, details=None):
         'created_at': created_at
     }
     
-    messenger.send_message(message=json.dumps(activity_item), subject="User Activity")
+    # Per-user message group: the vector updater must apply one user's events serially
+    messenger.send_message(
+        message=json.dumps(activity_item),
+        subject="User Activity",
+        group_id=str(user_id) if user_id else None,
+        deduplication_id=activity_id
+    )
 
     return Activity(**activity_item)
+
+
+# -------------------------
+# Track many activities (batched publish)
+# -------------------------
+def track_activities(user_id, activity_type, items):
+    """
+    Record one activity per (product_id, details) in `items`, publishing
+    them in SNS batches instead of one call each.
+    """
+    created_at = datetime.utcnow().isoformat()
+    activity_items = [
+        {
+            'activity_id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'activity_type': activity_type,
+            'product_id': product_id,
+            'details': details,
+            'created_at': created_at
+        }
+        for product_id, details in items
+    ]
+    if not activity_items:
+        return []
+
+    messenger.send_messages(
+        [json.dumps(item) for item in activity_items],
+        subject="User Activity",
+        group_id=str(user_id) if user_id else None,
+        deduplication_ids=[item['activity_id'] for item in activity_items]
+    )
+
+    return [Activity(**item) for item in activity_items]
@@ -0,0 +1,61 @@
+import threading
+from app.config import Config
+from app.database import get_session
+from app.models.product import Product
+from src.search.catalog import CatalogIndex
+
+_lock = threading.Lock()
+_index = None
+
+
+def load_products(since=None, batch_size=1000):
+    """
+    Stream products updated at or after `since` as dicts, oldest update first.
+    Rows are fetched `batch_size` at a time so a full build never holds the
+    whole result set.
+    """
+    session = next(get_session())
+    try:
+        query = session.query(*Product.columns())
+        if since is not None:
+            # Inclusive: re-indexing a product is idempotent, missing one is not
+            query = query.filter(Product.updated_at >= since)
+        for row in query.order_by(Product.updated_at).yield_per(batch_size):
+            yield Product.row_to_dict(row)
+    finally:
+        session.close()
+
+
+def get_catalog_index():
+    """The shared catalog index, or None when CATALOG_INDEX_ENABLED is off."""
+    global _index
+    if not Config.CATALOG_INDEX_ENABLED:
+        return None
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = CatalogIndex(loader=load_products)
+    return _index
+
+
+def search_catalog(search_query, category=None, page=1, per_page=6, exclude_ids=None):
+    """Answer a listing search from memory, or None if the index is disabled or still building."""
+    index = get_catalog_index()
+    if index is None or not index.ready:
+        return None
+    return index.search(search_query, category=category, page=page, per_page=per_page, exclude_ids=exclude_ids)
+
+
+def index_product(product_dict):
+    """Make a newly written product searchable in this process right away."""
+    index = get_catalog_index()
+    if index is not None:
+        index.add(product_dict)
+
+
+def start_catalog_index():
+    """Build the index from a streamed scan, then poll `updated_at` for changes."""
+    index = get_catalog_index()
+    if index is not None:
+        index.start(interval=Config.CATALOG_INDEX_REFRESH_INTERVAL)
+    return index
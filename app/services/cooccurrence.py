@@ -0,0 +1,64 @@
+from datetime import timedelta
+from sqlalchemy import func
+from app.config import Config
+from app.database import get_session
+from app.models.cart import CartItem
+from app.models.order import Order
+from src.recommender.registry import get_cooccurrence_engine
+
+# created_at comes from the clock of whichever app process wrote the row and
+# rows can commit well after it, so every scan re-reads this far behind the
+# watermark; the engine ignores interactions it has already counted
+INTERACTION_OVERLAP = timedelta(minutes=10)
+
+
+def load_interactions(since=None):
+    """
+    Distinct (user_id, product_id) pairs from orders and cart items created
+    after `since` minus INTERACTION_OVERLAP, so rows that committed late are
+    not skipped; pairs already returned by an earlier call may come back.
+
+    Returns (rows, watermark) where watermark is the newest created_at seen
+    (or `since` if nothing new).
+    """
+    session = next(get_session())
+    try:
+        rows = []
+        watermark = since
+        for model in (Order, CartItem):
+            query = (
+                session.query(model.user_id, model.product_id, func.max(model.created_at))
+                .group_by(model.user_id, model.product_id)
+            )
+            if since is not None:
+                query = query.filter(model.created_at > since - INTERACTION_OVERLAP)
+
+            for user_id, product_id, last_created in query.all():
+                rows.append((user_id, product_id))
+                if watermark is None or last_created > watermark:
+                    watermark = last_created
+        return rows, watermark
+    finally:
+        session.close()
+
+
+def get_similar_products(product_id: int, k: int = 10):
+    """[(product_id, score), ...] of products most often bought or carted together."""
+    return get_cooccurrence_engine().similar(product_id, k)
+
+
+def start_cooccurrence_engine():
+    """
+    Start reloading the co-occurrence index published under COOCCURRENCE_PATH
+    by app.jobs.build_cooccurrence whenever it changes.
+
+    Web workers and Lambda containers never build the index themselves (that
+    means holding the whole order/cart history per process): without
+    COOCCURRENCE_PATH similar-product lists stay empty.
+    """
+    engine = get_cooccurrence_engine()
+    if engine.path is None:
+        print("COOCCURRENCE_PATH is not set; similar products are disabled (see app.jobs.build_cooccurrence)")
+        return engine
+    engine.start(interval=Config.COOCCURRENCE_REFRESH_INTERVAL)
+    return engine
@@ -0,0 +1,54 @@
+from sqlalchemy import func
+from app.config import Config
+from app.database import get_session
+from app.models.cart import CartItem
+from app.models.order import Order
+from app.models.product import Product
+from src.recommender.registry import get_popularity_engine
+
+# Relative weight of one unit ordered vs one unit added to a cart
+ORDER_WEIGHT = 3.0
+CART_WEIGHT = 1.0
+
+
+def load_popularity(since=None):
+    """
+    Aggregate order and cart quantities per product.
+
+    Quantities are incremented and rows deleted in place, so every change
+    means a full re-aggregation. `since` is the previous watermark: a
+    (row count, max updated_at) pair per table. When neither table changed
+    no query beyond that check runs.
+
+    Returns (rows, watermark) where rows are (product_id, category, weight),
+    or None if nothing changed.
+    """
+    session = next(get_session())
+    try:
+        watermark = tuple(
+            tuple(session.query(func.count(), func.max(model.updated_at)).select_from(model).one())
+            for model in (Order, CartItem)
+        )
+        if watermark == since:
+            return None, watermark
+
+        rows = []
+        for model, weight in ((Order, ORDER_WEIGHT), (CartItem, CART_WEIGHT)):
+            query = (
+                session.query(model.product_id, Product.category, func.sum(model.quantity))
+                .join(Product, Product.product_id == model.product_id)
+                .group_by(model.product_id, Product.category)
+            )
+            for product_id, category, quantity in query.all():
+                rows.append((product_id, category, weight * float(quantity)))
+        return rows, watermark
+    finally:
+        session.close()
+
+
+def start_popularity_engine():
+    """Attach the database loader to the shared engine and start refreshing it."""
+    engine = get_popularity_engine()
+    engine.loader = load_popularity
+    engine.start(interval=Config.POPULARITY_REFRESH_INTERVAL)
+    return engine
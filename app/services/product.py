@@ -1,10 +1,79 @@
+import base64
+import json
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import func, or_, tuple_
+from app.config import Config
 from app.models.product import Product
 from app.database import get_session
 from app.services.activity import track_activity
+from app.services.catalog_search import index_product, search_catalog
+from src.cache.lru import LRUCache
 import uuid
 
+# Listing totals keyed by (search_query, category); cleared on writes
+_totals_cache = LRUCache(maxsize=Config.PRODUCT_TOTALS_CACHE_SIZE, ttl=Config.PRODUCT_TOTALS_CACHE_TTL)
+
+# product_id -> Product.to_dict(); any object with LRUCache's get/set/delete/clear works
+_product_cache = LRUCache(maxsize=Config.PRODUCT_CACHE_SIZE, ttl=Config.PRODUCT_CACHE_TTL)
+
+# Catalog version (newest updated_at), behind listing ETags
+_catalog_version = LRUCache(maxsize=1, ttl=Config.CATALOG_VERSION_TTL)
+
+def get_catalog_version():
+    """
+    Short string that changes whenever a product is added or updated (every
+    write sets updated_at, and products are never deleted).
+    Re-read at most every CATALOG_VERSION_TTL seconds; local writes reset it.
+    """
+    version = _catalog_version.get("version")
+    if version is None:
+        session = next(get_session())
+        try:
+            # One backward step on ix_products_updated_at, not a table scan
+            last_updated = session.query(func.max(Product.updated_at)).scalar()
+        finally:
+            session.close()
+        version = last_updated.isoformat() if last_updated else ""
+        _catalog_version.set("version", version)
+    return version
+
+def set_product_cache(cache):
+    """Swap the product cache backend (e.g. for a shared cache across workers)."""
+    global _product_cache
+    _product_cache = cache
+
+def _load_products(product_ids):
+    """
+    Serialized products by ID, read through the product cache: hits skip the
+    ORM and serialization, misses are fetched with a single IN query.
+    """
+    found = {}
+    misses = []
+    for product_id in product_ids:
+        cached = _product_cache.get(product_id)
+        if cached is not None:
+            found[product_id] = cached
+        else:
+            misses.append(product_id)
+
+    if misses:
+        session = next(get_session())
+        try:
+            for row in session.query(*Product.columns()).filter(Product.product_id.in_(misses)):
+                product_dict = Product.row_to_dict(row)
+                _product_cache.set(row.product_id, product_dict)
+                found[row.product_id] = product_dict
+        finally:
+            session.close()
+    return found
+
+def invalidate_product_caches(product_ids):
+    """Drop cached state affected by writes to `product_ids` (this process only)."""
+    _totals_cache.clear()
+    _catalog_version.clear()
+    for product_id in product_ids:
+        _product_cache.delete(product_id)
+
 def create_product(product_data, user_id=None):
     session = next(get_session())
     try:
@@ -26,84 +95,228 @@ def create_product(product_data, user_id=None):
         session.add(product)
         session.commit()
         session.refresh(product)
+        invalidate_product_caches([product.product_id])
+        index_product(product.to_dict())
 
         track_activity(user_id, "CREATE_PRODUCT", product_data['id'], product.to_dict())
         return product
     finally:
         session.close()
 
-def get_products_by_ids(product_ids, search_query=None, category=None):
+def get_products_by_ids(product_ids, search_query=None, category=None, search_mode=None):
     """
     Fetch products by a list of IDs, optionally filtered by search/category.
-    Sorted according to `product_ids`.
+    Sorted according to `product_ids`. Unfiltered lookups (e.g. recommendation
+    hydration) are served through the product cache.
     """
     if not product_ids:
         return []
 
+    if not search_query and not (category and category.lower() != 'all'):
+        product_dict = _load_products(list(dict.fromkeys(product_ids)))
+        # Copies, so callers can annotate results without touching the cache
+        return [dict(product_dict[i]) for i in product_ids if i in product_dict]
+
     session = next(get_session())
     try:
-        query = session.query(Product).filter(Product.product_id.in_(product_ids))
-
-        if category and category.lower() != 'all':
-            query = query.filter(Product.category == category)
+        query = session.query(*Product.columns()).filter(Product.product_id.in_(product_ids))
+        query, _ = _filter_products(query, search_query, category, search_mode)
 
-        if search_query:
-            pattern = f"%{search_query}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(pattern),
-                    Product.description.ilike(pattern)
-                )
-            )
-
-        products = query.all()
-        product_dict = {p.product_id: p.to_dict() for p in products}
+        product_dict = {row.product_id: Product.row_to_dict(row) for row in query}
         sorted_products = [product_dict[i] for i in product_ids if i in product_dict]
 
         return sorted_products
     finally:
         session.close()
 
-def get_product(product_id: str):
+def get_product(product_id):
+    """Serialized product (cached), or None if it does not exist."""
+    try:
+        product_id = int(product_id)
+    except (TypeError, ValueError):
+        return None
+    product = _load_products([product_id]).get(product_id)
+    return dict(product) if product is not None else None
+
+def encode_cursor(created_at, product_id):
+    """Opaque keyset cursor for the row (created_at, product_id)."""
+    raw = json.dumps([created_at.isoformat(), product_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, product_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(product_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+SEARCH_MODES = ("fulltext", "ilike", "index")
+
+def _totals_key(search_query=None, category=None, search_mode=None):
+    if category and category.lower() == 'all':
+        category = None
+    if not search_query:
+        search_mode = None
+    return (search_query or None, category or None, search_mode or Config.PRODUCT_SEARCH_MODE)
+
+def _filter_products(query, search_query=None, category=None, search_mode=None):
+    """
+    Apply the category and search filters.
+
+    Search modes:
+      - 'fulltext': stemmed match on the search_vector column (GIN index) or
+        trigram similarity on the name for typos and partial words; returns a
+        relevance expression (ts_rank + name similarity) to order by
+      - 'ilike': substring match on name/description, served by the trigram indexes
+      - 'index': answered by the in-memory catalog index in get_products;
+        queries that reach the database in this mode fall back to 'ilike'
+
+    Returns (query, rank) where rank is None when there is nothing to rank.
+    """
+    if category and category.lower() != 'all':
+        query = query.filter(Product.category == category)
+
+    if not search_query:
+        return query, None
+
+    search_mode = search_mode or Config.PRODUCT_SEARCH_MODE
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{search_mode}'")
+
+    if search_mode in ("ilike", "index"):
+        pattern = f"%{search_query}%"
+        query = query.filter(
+            or_(
+                Product.name.ilike(pattern),
+                Product.description.ilike(pattern)
+            )
+        )
+        return query, None
+
+    ts_query = func.websearch_to_tsquery('english', search_query)
+    query = query.filter(
+        or_(
+            Product.search_vector.op('@@')(ts_query),
+            Product.name.op('%')(search_query)
+        )
+    )
+    rank = func.ts_rank(Product.search_vector, ts_query) + func.similarity(Product.name, search_query)
+    return query, rank
+
+def count_products(search_query=None, category=None, search_mode=None):
+    """Number of products matching search/category, served from the totals cache when fresh."""
+    key = _totals_key(search_query, category, search_mode)
+    total = _totals_cache.get(key)
+    if total is not None:
+        return total
+
     session = next(get_session())
     try:
-        return session.query(Product).filter(Product.product_id == product_id).first()
+        query, _ = _filter_products(
+            session.query(func.count(Product.product_id)), search_query, category, search_mode
+        )
+        total = query.scalar()
+        _totals_cache.set(key, total)
+        return total
     finally:
         session.close()
 
-def get_products(page=1, per_page=6, search_query=None, category=None, exclude_ids=None):
+def get_products(page=1, per_page=6, search_query=None, category=None, exclude_ids=None, cursor=None,
+                 search_mode=None):
     """
     Fetch products with optional pagination, search, category filter, and exclude certain IDs.
+
+    Searches use `search_mode` (default Config.PRODUCT_SEARCH_MODE, see
+    _filter_products); full-text results are ordered by relevance, then
+    newest first. In 'index' mode page searches are served from the
+    in-process catalog index once it is built.
+
+    'total_items' counts every product matching search/category (excluded IDs
+    included). It comes from the totals cache, or from a window count computed
+    in the same query as the page on a cache miss.
+
+    With `cursor` (keyset mode) the page after that cursor is returned instead
+    of `page`, together with 'next_cursor' (None on the last page). Pass an
+    empty string for the first page. Each page is an index range scan on
+    (created_at, product_id), so deep pages cost the same as the first and do
+    not drift when products are added. Results stay in chronological order
+    (no relevance ranking) and no totals are computed in this mode.
     """
+    if cursor is None and page < 1:
+        raise ValueError("page must be at least 1")
+    if search_query and cursor is None and (search_mode or Config.PRODUCT_SEARCH_MODE) == "index":
+        result = search_catalog(search_query, category, page, per_page, exclude_ids)
+        if result is not None:
+            return result
+
     session = next(get_session())
     try:
-        query = session.query(Product)
+        # Plain column rows serialized with Product.row_to_dict: no entities,
+        # identity map or attribute instrumentation on the listing path
+        query, rank = _filter_products(session.query(*Product.columns()), search_query, category, search_mode)
 
-        if category and category.lower() != 'all':
-            query = query.filter(Product.category == category)
-
-        if search_query:
-            pattern = f"%{search_query}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(pattern),
-                    Product.description.ilike(pattern)
+        if cursor is not None:
+            if exclude_ids:
+                query = query.filter(~Product.product_id.in_(exclude_ids))
+            query = query.order_by(Product.created_at.desc(), Product.product_id.desc())
+            if cursor:
+                created_at, product_id = decode_cursor(cursor)
+                query = query.filter(
+                    tuple_(Product.created_at, Product.product_id) < tuple_(created_at, product_id)
                 )
-            )
+            # One extra row tells whether another page follows
+            rows = query.limit(per_page + 1).all()
+            last = rows[per_page - 1] if len(rows) > per_page else None
+            return {
+                'products': [Product.row_to_dict(row) for row in rows[:per_page]],
+                'next_cursor': encode_cursor(last.created_at, last.product_id) if last else None
+            }
 
-        if exclude_ids:
-            query = query.filter(~Product.product_id.in_(exclude_ids))
+        key = _totals_key(search_query, category, search_mode)
+        total_items = _totals_cache.get(key)
 
-        total_items = query.count()
-        products = (
-            query.order_by(Product.created_at.desc())
-                 .offset((page - 1) * per_page)
-                 .limit(per_page)
-                 .all()
-        )
+        if total_items is not None:
+            # Totals known: plain page query, no counting
+            if exclude_ids:
+                query = query.filter(~Product.product_id.in_(exclude_ids))
+            order = [Product.created_at.desc(), Product.product_id.desc()]
+            if rank is not None:
+                order.insert(0, rank.desc())
+            rows = (
+                query.order_by(*order)
+                     .offset((page - 1) * per_page)
+                     .limit(per_page)
+                     .all()
+            )
+        else:
+            # Count over the filtered set before exclusions, in the page query itself
+            columns = [func.count().over().label('total_items')]
+            if rank is not None:
+                columns.append(rank.label('rank'))
+            counted = query.add_columns(*columns).subquery()
+            page_query = session.query(*[counted.c[column.key] for column in Product.columns()], counted.c.total_items)
+            if exclude_ids:
+                page_query = page_query.filter(~counted.c.product_id.in_(exclude_ids))
+            order = [counted.c.created_at.desc(), counted.c.product_id.desc()]
+            if rank is not None:
+                order.insert(0, counted.c.rank.desc())
+            rows = (
+                page_query.order_by(*order)
+                          .offset((page - 1) * per_page)
+                          .limit(per_page)
+                          .all()
+            )
+            if rows:
+                total_items = rows[0].total_items
+            else:
+                # Past the last page: nothing to read the window count from
+                total_items = query.count()
+            _totals_cache.set(key, total_items)
 
         return {
-            'products': [p.to_dict() for p in products],
+            'products': [Product.row_to_dict(row) for row in rows],
             'total_pages': (total_items + per_page - 1) // per_page,
             'current_page': page,
             'total_items': total_items
@@ -112,11 +325,23 @@ def get_products(page=1, per_page=6, search_query=None, category=None, exclude_i
         session.close()
 
 
-def full_scan_products():
-    """Fetch all products without pagination (not recommended for huge tables)."""
+def stream_products(after_id=None, batch_size=1000):
+    """
+    Yield every product as a dict in product_id order, in constant memory.
+
+    Rows come from a server-side cursor `batch_size` at a time. Pass the last
+    product_id received as `after_id` to resume an interrupted scan.
+    """
     session = next(get_session())
     try:
-        products = session.query(Product).all()
-        return [product.to_dict() for product in products]
+        query = session.query(*Product.columns())
+        if after_id is not None:
+            query = query.filter(Product.product_id > after_id)
+        for row in query.order_by(Product.product_id).yield_per(batch_size):
+            yield Product.row_to_dict(row)
     finally:
         session.close()
+
+def full_scan_products():
+    """Fetch all products as a list; prefer stream_products for large tables."""
+    return list(stream_products())
@@ -0,0 +1,161 @@
+import csv
+import json
+from datetime import datetime
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from app.database import get_session
+from app.models.product import Product
+from app.services.activity import track_activities
+from app.services.catalog_search import index_product
+from app.services.product import invalidate_product_caches
+
+# Columns refreshed when an imported product_id already exists (created_at is kept)
+UPSERT_COLUMNS = ("name", "description", "price", "image", "type", "category", "updated_at")
+
+# Per-row errors returned to the caller are capped; the count is always exact
+MAX_REPORTED_ERRORS = 1000
+
+
+def parse_products(stream, fmt="ndjson"):
+    """
+    Yield (row_number, product_data) from an NDJSON or CSV text stream.
+    Rows that cannot be parsed yield (row_number, ValueError) instead of
+    stopping the import.
+    """
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(stream), start=1):
+            yield row_number, {k: v for k, v in row.items() if v not in (None, "")}
+    elif fmt == "ndjson":
+        for row_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield row_number, ValueError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(data, dict):
+                yield row_number, ValueError("Expected a JSON object")
+                continue
+            yield row_number, data
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'")
+
+
+def product_row(product_data, now):
+    """Validate and map create_product-style input to a products row."""
+    missing = [field for field in ("id", "name", "price", "type") if product_data.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+    try:
+        product_id = int(product_data["id"])
+        price = float(product_data["price"])
+    except (TypeError, ValueError):
+        raise ValueError("'id' must be an integer and 'price' a number")
+
+    return {
+        "product_id": product_id,
+        "name": product_data["name"],
+        "description": product_data.get("description", ""),
+        "price": price,
+        "image": product_data.get("image", ""),
+        "type": product_data["type"],
+        "category": product_data.get("category", product_data["type"]),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def import_products(rows, user_id=None, batch_size=1000):
+    """
+    Upsert products in batches.
+
+    `rows` yields (row_number, product_data) as produced by parse_products
+    (product_data may be an exception for unparseable rows). Each batch is
+    one multi-row INSERT ... ON CONFLICT (product_id) DO UPDATE. A failing
+    batch is retried row by row, so one bad row never rejects its neighbours.
+    Activity is published per batch: CREATE_PRODUCT for new product_ids,
+    UPDATE_PRODUCT for existing ones that were overwritten.
+
+    Returns {'imported', 'failed', 'errors': [{'row', 'id', 'error'}, ...]}.
+    """
+    report = {"imported": 0, "failed": 0, "errors": []}
+
+    def fail(row_number, product_id, error):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "id": product_id, "error": str(error)})
+
+    batch = {}
+    for row_number, product_data in rows:
+        if isinstance(product_data, Exception):
+            fail(row_number, None, product_data)
+            continue
+        try:
+            row = product_row(product_data, datetime.utcnow())
+        except ValueError as e:
+            fail(row_number, product_data.get("id"), e)
+            continue
+        # A product_id repeated within a batch keeps its last occurrence
+        # (one INSERT cannot update the same row twice)
+        batch.pop(row["product_id"], None)
+        batch[row["product_id"]] = (row_number, row)
+        if len(batch) >= batch_size:
+            _write_batch(list(batch.values()), user_id, report, fail)
+            batch = {}
+
+    if batch:
+        _write_batch(list(batch.values()), user_id, report, fail)
+    return report
+
+
+def _upsert_statement():
+    stmt = insert(Product)
+    return stmt.on_conflict_do_update(
+        index_elements=["product_id"],
+        set_={column: getattr(stmt.excluded, column) for column in UPSERT_COLUMNS},
+    ).returning(
+        *Product.columns(),
+        # xmax is 0 only on freshly inserted tuples, non-zero on conflict updates
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+
+def _write_batch(batch, user_id, report, fail):
+    stmt = _upsert_statement()
+    written = []
+
+    session = next(get_session())
+    try:
+        try:
+            written = session.execute(stmt, [row for _, row in batch]).all()
+            session.commit()
+        except Exception:
+            session.rollback()
+            written = []
+            # Isolate the offending rows
+            for row_number, row in batch:
+                try:
+                    written.extend(session.execute(stmt, [row]).all())
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    fail(row_number, row["product_id"], getattr(e, "orig", e))
+    finally:
+        session.close()
+
+    if not written:
+        return
+    report["imported"] += len(written)
+
+    # Rows come back as stored, so updated products keep their original created_at
+    created, updated = [], []
+    for row in written:
+        product = Product.row_to_dict(row)
+        (created if row.inserted else updated).append((product["id"], product))
+    invalidate_product_caches([product_id for product_id, _ in created + updated])
+    for _, product in created + updated:
+        index_product(product)
+    track_activities(user_id, "CREATE_PRODUCT", created)
+    track_activities(user_id, "UPDATE_PRODUCT", updated)
@@ -0,0 +1,180 @@
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from app.config import Config
+from app.database import get_session
+from app.models.recommendation import RecommendationInvalidation, UserRecommendation
+from src.recommender.invalidation import InvalidationListener
+from src.recommender.registry import get_recommender, invalidate_user_recommendations
+
+# Invalidations are re-read this far behind the newest one seen: concurrent
+# writers can commit out of timestamp order
+INVALIDATION_OVERLAP = timedelta(seconds=5)
+
+_lock = threading.Lock()
+_listener = None
+
+
+def get_materialized_recommendations(user_id, top_k_similar_users=5, top_k_items=10, max_age=None):
+    """
+    Read precomputed recommendations for a user.
+    Returns a list of (product_id, score), or None if the row is missing,
+    older than `max_age` or computed before the user's vector last changed.
+    """
+    max_age = Config.RECOMMENDATION_TABLE_MAX_AGE if max_age is None else max_age
+
+    session = next(get_session())
+    try:
+        row = (
+            session.query(
+                UserRecommendation.items,
+                UserRecommendation.computed_at,
+                RecommendationInvalidation.invalidated_at,
+            )
+            .outerjoin(RecommendationInvalidation, RecommendationInvalidation.user_id == UserRecommendation.user_id)
+            .filter(
+                UserRecommendation.user_id == str(user_id),
+                UserRecommendation.top_k_similar_users == top_k_similar_users,
+                UserRecommendation.top_k_items == top_k_items,
+            )
+            .one_or_none()
+        )
+    finally:
+        session.close()
+
+    if row is None:
+        return None
+    items, computed_at, invalidated_at = row
+    if computed_at < datetime.utcnow() - timedelta(seconds=max_age):
+        return None
+    if invalidated_at is not None and computed_at < invalidated_at:
+        return None
+    return [(int(idx), float(score)) for idx, score in items]
+
+
+def get_user_recommendations(user_id, top_k_similar_users=5, top_k_items=10):
+    """
+    Recommendations for a user: the in-process cache, then the materialized
+    table, and live computation only when the row is missing or stale.
+    Materialized results are cached too, so they are dropped with the rest
+    when the user's vector changes.
+    """
+    recommender = get_recommender(top_k_similar_users=top_k_similar_users, top_k_items=top_k_items)
+    cached = recommender.pipeline.cached(user_id)
+    if cached is not None:
+        return cached
+
+    try:
+        materialized = get_materialized_recommendations(user_id, top_k_similar_users, top_k_items)
+    except Exception as e:
+        print(f"Error reading materialized recommendations: {e}")
+        materialized = None
+
+    if materialized is not None:
+        return recommender.pipeline.store(user_id, materialized)
+
+    return recommender.recommend(user_id)
+
+
+def save_recommendations_bulk(recommendations, top_k_similar_users=5, top_k_items=10, computed_at=None):
+    """
+    Upsert many users' recommendations in one executemany round trip.
+
+    :param recommendations: dict of user_id -> [(product_id, score), ...]
+    """
+    if not recommendations:
+        return 0
+
+    computed_at = computed_at or datetime.utcnow()
+    rows = [
+        {
+            "user_id": str(user_id),
+            "top_k_similar_users": top_k_similar_users,
+            "top_k_items": top_k_items,
+            "items": [[int(idx), float(score)] for idx, score in items],
+            "computed_at": computed_at,
+        }
+        for user_id, items in recommendations.items()
+    ]
+
+    stmt = insert(UserRecommendation)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "top_k_similar_users", "top_k_items"],
+        set_={"items": stmt.excluded.items, "computed_at": stmt.excluded.computed_at},
+    )
+
+    session = next(get_session())
+    try:
+        session.execute(stmt, rows)
+        session.commit()
+        return len(rows)
+    finally:
+        session.close()
+
+
+def mark_recommendations_stale(user_ids):
+    """
+    Record that these users' vectors changed, so every web worker drops its
+    cached recommendations for them (see start_recommendation_invalidation).
+    Called by the activity updater after its vector writes.
+    """
+    user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    if not user_ids:
+        return 0
+
+    stmt = insert(RecommendationInvalidation).values([{"user_id": user_id} for user_id in user_ids])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"], set_={"invalidated_at": func.timezone("UTC", func.now())}
+    )
+
+    session = next(get_session())
+    try:
+        session.execute(stmt)
+        session.commit()
+        return len(user_ids)
+    finally:
+        session.close()
+
+
+def load_invalidations(since=None):
+    """
+    Users invalidated after `since`.
+
+    The watermark is (newest invalidated_at, invalidations already returned
+    within INVALIDATION_OVERLAP of it), so late commits are still picked up
+    without invalidating the same change twice. With `since` None the scan
+    starts at the newest invalidation (InvalidationListener ignores the users
+    returned by that first call).
+    """
+    session = next(get_session())
+    try:
+        if since is None:
+            latest = session.query(func.max(RecommendationInvalidation.invalidated_at)).scalar()
+            since = (latest, frozenset())
+        latest, seen = since
+        query = session.query(RecommendationInvalidation.user_id, RecommendationInvalidation.invalidated_at)
+        if latest is not None:
+            query = query.filter(RecommendationInvalidation.invalidated_at > latest - INVALIDATION_OVERLAP)
+        rows = [row for row in map(tuple, query.all()) if row not in seen]
+    finally:
+        session.close()
+
+    timestamps = [invalidated_at for _, invalidated_at in rows]
+    if latest is not None:
+        timestamps.append(latest)
+    if not timestamps:
+        return [], since
+    newest = max(timestamps)
+    window = frozenset(entry for entry in seen.union(rows) if entry[1] > newest - INVALIDATION_OVERLAP)
+    return [user_id for user_id, _ in rows], (newest, window)
+
+
+def start_recommendation_invalidation():
+    """Poll for users whose vectors changed and drop their cached recommendations in this process."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            _listener = InvalidationListener(loader=load_invalidations, on_invalidate=invalidate_user_recommendations)
+    _listener.start(interval=Config.RECOMMENDATION_INVALIDATION_INTERVAL)
+    return _listener
@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+from sqlalchemy import text
+from app.database import engine
+
+# Arbitrary application-wide key for pg_advisory_lock
+VECTOR_WRITE_LOCK_ID = 0x62615f766563
+
+
+@contextmanager
+def vector_write_lock():
+    """
+    Cross-process lock around read-modify-write passes over the user vectors
+    (ActivityVectorUpdater batches and compaction pages), so neither can
+    overwrite a vector the other has just written.
+    """
+    # Session-level lock on an autocommit connection: no transaction is held open
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": VECTOR_WRITE_LOCK_ID})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": VECTOR_WRITE_LOCK_ID})
@@ -1,3 +1,4 @@
+import hmac
 import jwt
 from flask import request, jsonify
 from app.services.auth import get_user_by_id
@@ -30,6 +31,21 @@ def token_required(f):
         return f(*args, **kwargs)
     return decorated
 
+def service_key_required(f):
+    """
+    Restrict an internal endpoint to callers holding Config.SERVICE_API_KEY,
+    sent as the X-API-Key header. User tokens are not accepted.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not Config.SERVICE_API_KEY:
+            return jsonify({'message': 'Service endpoint is disabled'}), 403
+        api_key = request.headers.get('X-API-Key', '')
+        if not hmac.compare_digest(api_key.encode(), Config.SERVICE_API_KEY.encode()):
+            return jsonify({'message': 'Invalid API key'}), 401
+        return f(*args, **kwargs)
+    return decorated
+
 def verify_token(token):
     """
     Verifies a JWT token and returns the current_user dict if valid.
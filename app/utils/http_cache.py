@@ -0,0 +1,34 @@
+import hashlib
+from flask import request, make_response
+
+
+def make_etag(*parts):
+    """Opaque (unquoted) entity tag derived from the values that determine a response."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return digest[:32]
+
+
+def request_etag_matches(etag):
+    """Whether the client's If-None-Match already holds `etag` (weak comparison)."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag, cache_control):
+    """Empty 304 response carrying the validators the client should keep."""
+    response = make_response("", 304)
+    return with_cache_headers(response, etag, cache_control)
+
+
+def with_cache_headers(response, etag, cache_control):
+    response.set_etag(etag)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    # Signed-in requests get a different (personalised, tracked) response, so
+    # shared caches must key on the Authorization header
+    response.vary.add("Authorization")
+    return response
+
+
+def public_cache_control(max_age):
+    """Shared caches (API Gateway, CDN) and browsers may reuse for `max_age` seconds."""
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
@@ -0,0 +1,181 @@
+"""
+Recommender benchmark suite.
+
+Generates synthetic power-law interaction vectors, loads them through
+`insert_sparse_points_bulk` into a vector store (Qdrant local ':memory:'
+mode by default, or the in-process backend) and reports latency percentiles
+and throughput for `search_similar_by_id`, `InteractionAggregator.aggregate`
+and `SparseRecommender.recommend` across top_k settings.
+
+    python -m benchmarks.recommender_bench --users 10000 --items 1000 \
+        --top-k 5 20 100 --output bench_results.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+import numpy as np
+from qdrant_client import QdrantClient
+from benchmarks.synthetic import generate_users
+from src.recommender.aggregator import InteractionAggregator
+from src.recommender.recommender import SparseRecommender
+from src.vectorstore.memory import InMemorySparseStore
+from src.vectorstore.store import SparseClient
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 5) -> Dict[str, float]:
+    """Run `fn` repeatedly and summarize per-call latency in milliseconds."""
+    for _ in range(min(warmup, iterations)):
+        fn()
+
+    timings = np.empty(iterations, dtype=np.float64)
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(timings * 1000, [50, 95, 99])
+    return {
+        "iterations": iterations,
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "mean_ms": round(float(timings.mean() * 1000), 4),
+        "throughput_per_s": round(iterations / elapsed, 2),
+    }
+
+
+def build_store(backend: str):
+    if backend == "memory":
+        return InMemorySparseStore()
+    return SparseClient(client=QdrantClient(":memory:"))
+
+
+def load_store(store, args) -> Dict[str, float]:
+    """Insert the synthetic dataset and return load statistics."""
+    users = generate_users(
+        n_users=args.users,
+        n_items=args.items,
+        mean_interactions=args.mean_interactions,
+        item_exponent=args.item_exponent,
+        seed=args.seed,
+    )
+    counts = {"nnz": 0}
+
+    def counted(points):
+        for point in points:
+            counts["nnz"] += len(point["indices"])
+            yield point
+
+    started = time.perf_counter()
+    report = store.insert_sparse_points_bulk(
+        counted(users),
+        batch_size=args.load_batch_size,
+        max_workers=args.load_workers,
+    )
+    elapsed = time.perf_counter() - started
+    n_points, nnz = report.inserted, counts["nnz"]
+    return {
+        "points": n_points,
+        "non_zeros": nnz,
+        "mean_nnz_per_user": round(nnz / max(n_points, 1), 2),
+        "load_seconds": round(elapsed, 3),
+        "load_points_per_s": round(n_points / elapsed, 2) if elapsed else None,
+        "failed_batches": len(report.failed),
+    }
+
+
+def sample_user_ids(store, n: int, seed: int) -> List[str]:
+    ids = [str(point["id"]) for page in store.scroll_points(page_size=1024) for point in page]
+    return random.Random(seed).sample(ids, min(n, len(ids)))
+
+
+def run_backend(backend: str, args) -> Dict[str, object]:
+    store = build_store(backend)
+    result = {"backend": backend, "load": load_store(store, args), "top_k": {}}
+
+    user_ids = sample_user_ids(store, args.queries, args.seed)
+    if not user_ids:
+        return result
+
+    for top_k in args.top_k:
+        cursor = {"i": 0}
+
+        def next_user() -> str:
+            cursor["i"] = (cursor["i"] + 1) % len(user_ids)
+            return user_ids[cursor["i"]]
+
+        # Neighbour lists fetched up front so `aggregate` is timed alone
+        neighbours = {uid: store.search_similar_by_id(uid, top_k=top_k) for uid in user_ids}
+        own = {uid: store.get_point_by_id(uid)["indices"] for uid in user_ids}
+        recommender = SparseRecommender(top_k_similar_users=top_k, top_k_items=args.top_k_items, client=store)
+        aggregators = {
+            "python": InteractionAggregator(mode="sum", engine="python"),
+            "numpy": InteractionAggregator(mode="sum", engine="numpy"),
+        }
+
+        stats = {
+            "search_similar_by_id": measure(
+                lambda: store.search_similar_by_id(next_user(), top_k=top_k), args.iterations
+            ),
+            "recommend": measure(lambda: recommender.recommend(next_user()), args.iterations),
+        }
+        for name, aggregator in aggregators.items():
+            def run_aggregate(aggregator=aggregator):
+                uid = next_user()
+                aggregator.aggregate(neighbours[uid], own[uid], top_k=args.top_k_items)
+            stats[f"aggregate_{name}"] = measure(run_aggregate, args.iterations)
+
+        result["top_k"][str(top_k)] = stats
+        print(f"[{backend}] top_k={top_k}: " + ", ".join(
+            f"{name} p50={s['p50_ms']}ms p99={s['p99_ms']}ms" for name, s in stats.items()
+        ))
+
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sparse recommender.")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--mean-interactions", type=float, default=20.0)
+    parser.add_argument("--item-exponent", type=float, default=1.1)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--top-k-items", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200, help="Distinct users sampled as queries")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--load-batch-size", type=int, default=1000)
+    parser.add_argument("--load-workers", type=int, default=1)
+    parser.add_argument("--backend", choices=["qdrant", "memory"], nargs="+", default=["qdrant", "memory"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    report = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "results": [run_backend(backend, args) for backend in args.backend],
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
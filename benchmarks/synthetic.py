@@ -0,0 +1,53 @@
+"""
+Synthetic user-item interaction generator for benchmarks.
+
+Item popularity and user activity both follow power laws, which is the
+shape that makes sparse similarity search expensive: a few items appear in
+most user vectors and a few users have very long histories.
+"""
+import uuid
+from typing import Any, Dict, Iterator
+import numpy as np
+
+
+def generate_users(
+    n_users: int,
+    n_items: int,
+    mean_interactions: float = 20.0,
+    item_exponent: float = 1.1,
+    activity_shape: float = 1.5,
+    max_interactions: int = 2000,
+    seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield sparse user vectors as {'id', 'indices', 'values'} dicts.
+
+    Args:
+        n_users: Number of users (points) to generate.
+        n_items: Size of the item catalog (indices are 1..n_items).
+        mean_interactions: Target mean number of distinct items per user.
+        item_exponent: Zipf exponent of item popularity.
+        activity_shape: Pareto shape of per-user activity (lower = heavier tail).
+        max_interactions: Cap on items per user.
+        seed: RNG seed, for reproducible datasets.
+    """
+    rng = np.random.default_rng(seed)
+
+    ranks = np.arange(1, n_items + 1, dtype=np.float64)
+    item_p = ranks ** -item_exponent
+    item_p /= item_p.sum()
+    # Shuffle so popularity is not correlated with the item id
+    item_ids = rng.permutation(n_items).astype(np.int64) + 1
+
+    # Pareto with mean scaled to `mean_interactions`
+    scale = mean_interactions * (activity_shape - 1) / activity_shape
+    for _ in range(n_users):
+        length = int(min(max_interactions, n_items, max(1, scale * (1 + rng.pareto(activity_shape)))))
+        picks = np.unique(rng.choice(n_items, size=length, p=item_p))
+        values = rng.integers(1, 6, size=picks.size).astype(np.float32)
+        yield {
+            "id": str(uuid.UUID(int=int(rng.integers(0, 2**63)) << 64 | int(rng.integers(0, 2**63)))),
+            "indices": item_ids[picks].tolist(),
+            "values": values.tolist(),
+        }
+
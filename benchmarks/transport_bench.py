@@ -0,0 +1,127 @@
+"""
+REST vs gRPC transport benchmark for SparseClient.
+
+Loads synthetic power-law user vectors into a scratch collection of a real
+Qdrant server, then times the recommender's neighbour-query shape over each
+transport: `get_point_by_id` + `search_similar_by_id` (vectors returned),
+batched retrieval and batched vector search.
+
+    python -m benchmarks.transport_bench --url http://localhost:6333 \
+        --users 20000 --top-k 5 20 100 --output transport_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+from datetime import datetime
+from typing import Dict, List
+from qdrant_client import QdrantClient
+from benchmarks.recommender_bench import git_revision, measure
+from benchmarks.synthetic import generate_users
+from src.vectorstore.connection import qdrant_client_kwargs
+from src.vectorstore.store import SparseClient
+
+
+def build_client(transport: str, args) -> SparseClient:
+    os.environ.update({
+        "QDRANT_URL": args.url,
+        "QDRANT_TRANSPORT": transport,
+        "QDRANT_GRPC_PORT": str(args.grpc_port),
+        "QDRANT_COLLECTION_NAME": args.collection,
+    })
+    if args.api_key:
+        os.environ["QDRANT_API_KEY"] = args.api_key
+    return SparseClient(client=QdrantClient(**qdrant_client_kwargs()))
+
+
+def run_transport(transport: str, user_ids: List[str], args) -> Dict[str, object]:
+    store = build_client(transport, args)
+    rng = random.Random(args.seed)
+    result = {"transport": transport, "top_k": {}}
+
+    def pick() -> str:
+        return user_ids[rng.randrange(len(user_ids))]
+
+    def pick_many() -> List[str]:
+        return [pick() for _ in range(args.batch)]
+
+    result["get_point_by_id"] = measure(lambda: store.get_point_by_id(pick()), args.iterations)
+    result["get_points_by_ids"] = measure(lambda: store.get_points_by_ids(pick_many()), args.iterations)
+
+    points = list(store.get_points_by_ids(user_ids[:args.batch]).values())
+    for top_k in args.top_k:
+        stats = {
+            "search_similar_by_id": measure(
+                lambda: store.search_similar_by_id(pick(), top_k=top_k), args.iterations
+            ),
+            "search_similar_by_vectors_batch": measure(
+                lambda: store.search_similar_by_vectors_batch(points, top_k=top_k), args.iterations
+            ),
+        }
+        result["top_k"][str(top_k)] = stats
+        print(f"[{transport}] top_k={top_k}: " + ", ".join(
+            f"{name} p50={s['p50_ms']}ms p99={s['p99_ms']}ms" for name, s in stats.items()
+        ))
+
+    store.client.close()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare Qdrant REST and gRPC transports.")
+    parser.add_argument("--url", required=True, help="Qdrant REST URL, e.g. http://localhost:6333")
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--collection", default="transport_bench")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--mean-interactions", type=float, default=30.0)
+    parser.add_argument("--top-k", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--batch", type=int, default=64, help="Users per batched call")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--transport", choices=["rest", "grpc"], nargs="+", default=["rest", "grpc"])
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collection")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="transport_results.json")
+    args = parser.parse_args(argv)
+
+    loader = build_client("rest", args)
+    user_ids = []
+
+    def collect(points):
+        for point in points:
+            user_ids.append(point["id"])
+            yield point
+
+    report = loader.insert_sparse_points_bulk(
+        collect(generate_users(
+            n_users=args.users,
+            n_items=args.items,
+            mean_interactions=args.mean_interactions,
+            seed=args.seed,
+        )),
+        batch_size=1000,
+        max_workers=4,
+    )
+    print(f"Loaded {report.inserted} users into '{args.collection}'")
+
+    try:
+        results = [run_transport(transport, user_ids, args) for transport in args.transport]
+    finally:
+        if not args.keep:
+            loader.client.delete_collection(args.collection)
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "params": {k: v for k, v in vars(args).items() if k != "api_key"},
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
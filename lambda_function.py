@@ -2,8 +2,8 @@ import os
 import base64
 from dotenv import load_dotenv
 from app import create_app
-from app.database import Base, engine
 import app.models  # ensures all models are loaded
+from app.jobs.migrate import migrate
 import awsgi
 import logging
 
@@ -19,25 +19,37 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # -----------------------------
-# Initialize database (if needed)
+# Database schema
 # -----------------------------
-try:
-    Base.metadata.create_all(engine)
-    logger.info("All tables created successfully!")
-except Exception as e:
-    logger.exception("Database initialization failed.")
+# Created by the migration job, not on every cold start: the deploy
+# workflow invokes this function with {"job": "migrate"} (see lambda_handler)
 
 # -----------------------------
 # Determine which service(s) to run
 # -----------------------------
 service_env = os.getenv("SERVICE")
-service_names = [service_env] if service_env else ["auth", "products", "cart"]
+service_names = [service_env] if service_env else ["auth", "products", "cart", "recommendation"]
 
 # -----------------------------
 # Create Flask app
 # -----------------------------
 app = create_app(service_names=service_names)
 
+# -----------------------------
+# Warm shared recommender (once per container)
+# -----------------------------
+if {"products", "recommendation"} & set(service_names):
+    from src.recommender.registry import warm_up
+    from app.services.popularity import start_popularity_engine
+    from app.services.cooccurrence import start_cooccurrence_engine
+    from app.services.catalog_search import start_catalog_index
+    from app.services.recommendation import start_recommendation_invalidation
+    warm_up()
+    start_popularity_engine()
+    start_cooccurrence_engine()
+    start_catalog_index()
+    start_recommendation_invalidation()
+
 # -----------------------------
 # Global error handler for Flask
 # -----------------------------
@@ -98,6 +110,12 @@ def preprocess_event(event):
 # Lambda handler
 # -----------------------------
 def lambda_handler(event, context):
+    # Deploy-time schema migration, invoked directly rather than through API Gateway
+    if event.get("job") == "migrate":
+        migrate()
+        logger.info("Schema is up to date")
+        return {"migrated": True}
+
     try:
         processed_event = preprocess_event(event)
         response = awsgi.response(app, processed_event, context)
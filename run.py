@@ -1,14 +1,12 @@
 import os
 from dotenv import load_dotenv
 from app import create_app
-from app.database import Base, engine
 import app.models  # ensures all models are loaded
 
 load_dotenv()
 
-# Initialize database (only if needed)
-Base.metadata.create_all(engine)
-print("All tables created successfully!")
+# The schema (extensions, tables, indexes) is created by the migration job,
+# python -m app.jobs.migrate, which must run before the services start
 
 # Determine which service(s) to run
 # SERVICE can be: "auth", "products", "cart", "recommendation"
@@ -18,6 +16,19 @@ service_names = [service_env] if service_env else None
 # Create Flask app with selected service(s)
 app = create_app(service_names=service_names)
 
+# Warm the shared recommender once per worker for services that use it
+if service_names is None or {"products", "recommendation"} & set(service_names):
+    from src.recommender.registry import warm_up
+    from app.services.popularity import start_popularity_engine
+    from app.services.cooccurrence import start_cooccurrence_engine
+    from app.services.catalog_search import start_catalog_index
+    from app.services.recommendation import start_recommendation_invalidation
+    warm_up()
+    start_popularity_engine()
+    start_cooccurrence_engine()
+    start_catalog_index()
+    start_recommendation_invalidation()
+
 if __name__ == "__main__":
     PORT = int(os.getenv("PORT", 5000))
     DEBUG = os.getenv("DEBUG", "True") == "True"
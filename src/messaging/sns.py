@@ -44,13 +44,56 @@ class SNSMessenger:
         except ClientError as e:
             print(f"Error subscribing SQS to SNS: {e}")
 
-    def send_message(self, message: str, subject: str = "Notification"):
+    @property
+    def fifo(self) -> bool:
+        return bool(self.topic_arn) and self.topic_arn.endswith(".fifo")
+
+    def send_message(self, message: str, subject: str = "Notification", group_id: str = None, deduplication_id: str = None):
+        """
+        Publish one message. On a FIFO topic, messages sharing `group_id` are
+        delivered in order and one at a time per group.
+        """
+        kwargs = {}
+        if self.fifo:
+            kwargs["MessageGroupId"] = group_id or "default"
+            if deduplication_id:
+                kwargs["MessageDeduplicationId"] = deduplication_id
         try:
             response = self.sns_client.publish(
                 TopicArn=self.topic_arn,
                 Message=message,
-                Subject=subject
+                Subject=subject,
+                **kwargs
             )
             print(f"Message sent! Message ID: {response['MessageId']}")
         except ClientError as e:
-            print(f"Error sending message: {e}")
\ No newline at end of file
+            print(f"Error sending message: {e}")
+
+    def send_messages(self, messages, subject: str = "Notification", group_id: str = None, deduplication_ids=None):
+        """
+        Publish many messages with PublishBatch (10 per call, the SNS limit).
+        `group_id` / `deduplication_ids` apply on FIFO topics, as in send_message.
+        Returns the number of messages that could not be published.
+        """
+        failed = 0
+        for start in range(0, len(messages), 10):
+            entries = []
+            for i, message in enumerate(messages[start:start + 10]):
+                entry = {"Id": str(i), "Message": message, "Subject": subject}
+                if self.fifo:
+                    entry["MessageGroupId"] = group_id or "default"
+                    if deduplication_ids:
+                        entry["MessageDeduplicationId"] = deduplication_ids[start + i]
+                entries.append(entry)
+            try:
+                response = self.sns_client.publish_batch(
+                    TopicArn=self.topic_arn,
+                    PublishBatchRequestEntries=entries
+                )
+                for failure in response.get("Failed", []):
+                    print(f"Error sending message {start + int(failure['Id'])}: {failure.get('Message')}")
+                failed += len(response.get("Failed", []))
+            except ClientError as e:
+                print(f"Error sending message batch: {e}")
+                failed += len(entries)
+        return failed
@@ -0,0 +1,116 @@
+import json
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import boto3
+from botocore.exceptions import ClientError
+
+# (receipt handle, decoded activity)
+ReceivedMessage = Tuple[str, Dict[str, Any]]
+
+
+def parse_activity_message(body: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode an activity from an SQS message body.
+    Handles both SNS-wrapped notifications and raw message delivery.
+    """
+    try:
+        message = json.loads(body)
+        if isinstance(message, dict) and message.get("Type") == "Notification" and "Message" in message:
+            message = json.loads(message["Message"])
+        return message if isinstance(message, dict) else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SQSActivitySource:
+    def __init__(
+        self,
+        sqs_queue_arn: str,
+        region_name: str = "us-east-1",
+        endpoint_url: str = None,
+        aws_access_key_id: str = None,
+        aws_secret_access_key: str = None
+    ):
+        """
+        Read activity events published by SNSMessenger from the subscribed SQS queue.
+        Works both on AWS and local (e.g., LocalStack), like SNSMessenger.
+        """
+        client_kwargs = {
+            "region_name": region_name,
+            "endpoint_url": endpoint_url
+        }
+        if aws_access_key_id and aws_secret_access_key:
+            client_kwargs["aws_access_key_id"] = aws_access_key_id
+            client_kwargs["aws_secret_access_key"] = aws_secret_access_key
+
+        self.sqs_client = boto3.client('sqs', **client_kwargs)
+
+        # arn:aws:sqs:<region>:<account>:<name>
+        _, _, _, _, account_id, queue_name = sqs_queue_arn.split(":")
+        self.queue_url = self.sqs_client.get_queue_url(
+            QueueName=queue_name,
+            QueueOwnerAWSAccountId=account_id
+        )["QueueUrl"]
+
+    def receive(self, max_messages: int = 100, wait_seconds: int = 1) -> List[ReceivedMessage]:
+        """
+        Receive up to `max_messages` activities, in calls of at most 10 (the SQS limit).
+        Only the first call long-polls; the batch ends as soon as the queue is drained.
+        """
+        received = []
+        while len(received) < max_messages:
+            try:
+                response = self.sqs_client.receive_message(
+                    QueueUrl=self.queue_url,
+                    MaxNumberOfMessages=min(10, max_messages - len(received)),
+                    WaitTimeSeconds=wait_seconds if not received else 0
+                )
+            except ClientError as e:
+                print(f"Error receiving messages: {e}")
+                break
+
+            messages = response.get("Messages", [])
+            if not messages:
+                break
+            for message in messages:
+                activity = parse_activity_message(message["Body"])
+                # Undecodable messages are still acknowledged so they don't loop forever
+                received.append((message["ReceiptHandle"], activity or {}))
+        return received
+
+    def acknowledge(self, receipt_handles: Iterable[str]):
+        """Delete processed messages, 10 per call."""
+        handles = list(receipt_handles)
+        for start in range(0, len(handles), 10):
+            entries = [
+                {"Id": str(i), "ReceiptHandle": handle}
+                for i, handle in enumerate(handles[start:start + 10])
+            ]
+            try:
+                self.sqs_client.delete_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            except ClientError as e:
+                print(f"Error deleting messages: {e}")
+
+
+class InMemoryActivitySource:
+    """Local stand-in for SQSActivitySource (tests, scripts)."""
+
+    def __init__(self, activities: Iterable[Dict[str, Any]] = ()):
+        self._queue = deque()
+        self._counter = 0
+        self.acknowledged: List[str] = []
+        for activity in activities:
+            self.put(activity)
+
+    def put(self, activity: Dict[str, Any]):
+        self._counter += 1
+        self._queue.append((str(self._counter), activity))
+
+    def receive(self, max_messages: int = 100, wait_seconds: int = 0) -> List[ReceivedMessage]:
+        received = []
+        while self._queue and len(received) < max_messages:
+            received.append(self._queue.popleft())
+        return received
+
+    def acknowledge(self, receipt_handles: Iterable[str]):
+        self.acknowledged.extend(receipt_handles)
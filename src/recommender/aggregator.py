@@ -1,5 +1,7 @@
 from collections import defaultdict
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable
+import numpy as np
+from src.vectorstore.vector import as_list
 
 
 class InteractionAggregator:
@@ -7,17 +9,19 @@ class InteractionAggregator:
     Aggregates item interaction scores from multiple similar users.
     """
 
-    def __init__(self, mode: str = "sum"):
+    def __init__(self, mode: str = "sum", engine: str = "python"):
         """
         Args:
             mode (str): 'sum' or 'average' — defines how to combine similar users' scores.
+            engine (str): 'python' or 'numpy' — implementation used by `aggregate`.
         """
         self.mode = mode
+        self.engine = engine
 
     def aggregate(
         self,
         similar_users: List[Dict[str, List[float]]],
-        exclude_indices: List[int],
+        exclude_indices: Iterable[int],
         top_k: int = 10
     ) -> List[Tuple[int, float]]:
         """
@@ -31,17 +35,21 @@ class InteractionAggregator:
         Returns:
             Sorted list of (item_index, aggregated_score)
         """
+        if self.engine == "numpy":
+            return self.aggregate_vectorized(similar_users, exclude_indices, top_k)
+
         score_map = defaultdict(list)
+        exclude_set = set(as_list(exclude_indices))
 
         # Step 1: aggregate contributions
         for user in similar_users:
-            for idx, val in zip(user["indices"], user["values"]):
+            for idx, val in zip(as_list(user["indices"]), as_list(user["values"])):
                 score_map[idx].append(val)
 
         # Step 2: compute final score per item
         aggregated_scores = {}
         for idx, vals in score_map.items():
-            if idx in exclude_indices:
+            if idx in exclude_set:
                 continue
             if self.mode == "average":
                 aggregated_scores[idx] = sum(vals) / len(vals)
@@ -52,3 +60,50 @@ class InteractionAggregator:
         sorted_scores = sorted(aggregated_scores.items(), key=lambda x: x[1], reverse=True)
 
         return sorted_scores[:top_k]
+
+    def aggregate_vectorized(
+        self,
+        similar_users: List[Dict[str, List[float]]],
+        exclude_indices: Iterable[int],
+        top_k: int = 10
+    ) -> List[Tuple[int, float]]:
+        """
+        NumPy implementation of `aggregate` with identical output.
+
+        Contributions are concatenated and reduced with `np.bincount`, exclusions
+        are applied with a boolean mask and only the top_k candidates are sorted.
+        Ties keep the order in which items first appear, as in `aggregate`.
+        """
+        if top_k <= 0 or not similar_users:
+            return []
+
+        # Array-backed results (SparsePoint) are concatenated as-is, no per-user copy
+        indices = np.concatenate([u["indices"] for u in similar_users]).astype(np.int64, copy=False)
+        values = np.concatenate([u["values"] for u in similar_users]).astype(np.float64, copy=False)
+        if indices.size == 0:
+            return []
+
+        # Step 1: scatter-add contributions per unique item
+        items, first_pos, inverse = np.unique(indices, return_index=True, return_inverse=True)
+        scores = np.bincount(inverse, weights=values, minlength=items.size)
+        if self.mode == "average":
+            scores = scores / np.bincount(inverse, minlength=items.size)
+
+        # Step 2: drop items the target user already interacted with
+        exclude = np.asarray(as_list(exclude_indices), dtype=np.int64)
+        if exclude.size:
+            keep = ~np.isin(items, exclude)
+            items, first_pos, scores = items[keep], first_pos[keep], scores[keep]
+        if items.size == 0:
+            return []
+
+        # Step 3: partial sort — keep every item tied with the k-th score so the
+        # final ordering by (score desc, first appearance) is exact
+        if items.size > top_k:
+            kth = np.partition(scores, items.size - top_k)[items.size - top_k]
+            candidates = np.flatnonzero(scores >= kth)
+            items, first_pos, scores = items[candidates], first_pos[candidates], scores[candidates]
+
+        order = np.lexsort((first_pos, -scores))[:top_k]
+        return [(int(items[i]), float(scores[i])) for i in order]
+
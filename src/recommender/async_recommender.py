@@ -0,0 +1,100 @@
+import asyncio
+from typing import List, Dict, Optional, Tuple
+from src.vectorstore.async_store import AsyncSparseClient
+from src.recommender.cache import RecommendationCache
+from src.recommender.pipeline import RecommendationPipeline
+from src.recommender.popularity import PopularityEngine
+
+
+class AsyncSparseRecommender:
+    """
+    Async counterpart of SparseRecommender for event-loop workers and async routes.
+
+    Same aggregation, cache and cold-start fallback (RecommendationPipeline);
+    Qdrant calls are awaited so one process can keep many recommendation
+    requests in flight.
+    """
+
+    def __init__(
+        self,
+        client: AsyncSparseClient,
+        top_k_similar_users: int = 5,
+        top_k_items: int = 10,
+        cache: Optional[RecommendationCache] = None,
+        fallback: Optional[PopularityEngine] = None
+    ):
+        self.client = client
+        self.top_k_similar_users = top_k_similar_users
+        self.top_k_items = top_k_items
+        self.pipeline = RecommendationPipeline(top_k_similar_users, top_k_items, cache=cache, fallback=fallback)
+
+    async def recommend(self, user_id: str) -> List[Tuple[int, float]]:
+        """
+        Generate item recommendations for a user, awaiting the user lookup
+        and the neighbour search concurrently.
+        """
+        cached = self.pipeline.cached(user_id)
+        if cached is not None:
+            return cached
+
+        user_data, similar_users = await asyncio.gather(
+            self.client.get_point_by_id(user_id),
+            self.client.search_similar_by_id(point_id=user_id, top_k=self.top_k_similar_users),
+            # A missing user makes the ID search fail; only the lookup decides that case
+            return_exceptions=True
+        )
+        if isinstance(user_data, BaseException):
+            raise user_data
+        if user_data is None:
+            if self.pipeline.fallback is not None:
+                return self.pipeline.cold_start(user_id)
+            raise ValueError(f"User {user_id} not found in collection.")
+        if isinstance(similar_users, BaseException):
+            raise similar_users
+
+        return self.pipeline.finish(user_id, similar_users, user_data["indices"])
+
+    async def recommend_for_vector(self, user_id: str, indices: List[int], values: List[float]):
+        """Recommendations for a user whose sparse vector is already known."""
+        cached = self.pipeline.cached(user_id)
+        if cached is not None:
+            return cached
+
+        similar_users = await self.client.search_similar_by_vector(
+            indices=indices,
+            values=values,
+            top_k=self.top_k_similar_users,
+            exclude_id=user_id
+        )
+        return self.pipeline.finish(user_id, similar_users, indices)
+
+    async def recommend_many(self, user_ids: List[str], batch_size: int = 256) -> Dict[str, List[Tuple[int, float]]]:
+        """Async `SparseRecommender.recommend_many`; chunks are processed concurrently."""
+        results: Dict[str, List[Tuple[int, float]]] = {}
+        pending = []
+        for user_id in dict.fromkeys(str(u) for u in user_ids):
+            cached = self.pipeline.cached(user_id)
+            if cached is not None:
+                results[user_id] = cached
+            else:
+                pending.append(user_id)
+
+        async def run_chunk(chunk: List[str]):
+            users = await self.client.get_points_by_ids(chunk)
+            for user_id in chunk:
+                if user_id not in users:
+                    results[user_id] = self.pipeline.cold_start(user_id)
+            results.update(await self.recommend_for_points(list(users.values())))
+
+        await asyncio.gather(*(
+            run_chunk(pending[start:start + batch_size]) for start in range(0, len(pending), batch_size)
+        ))
+        return results
+
+    async def recommend_for_points(self, points: List[Dict]) -> Dict[str, List[Tuple[int, float]]]:
+        """Recommendations for already-fetched points in one batch query."""
+        neighbours = await self.client.search_similar_by_vectors_batch(points, top_k=self.top_k_similar_users)
+        return {
+            str(point["id"]): self.pipeline.finish(str(point["id"]), similar_users, point["indices"])
+            for point, similar_users in zip(points, neighbours)
+        }
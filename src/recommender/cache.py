@@ -0,0 +1,55 @@
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from src.cache.lru import LRUCache
+
+CacheKey = Tuple[str, int, int]
+
+
+class RecommendationCache:
+    """
+    Caches recommendation results per (user_id, top_k_similar_users, top_k_items).
+
+    Entries are bounded (LRU), expire after `ttl` seconds and can be dropped
+    for a single user when that user's interactions change.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl, on_evict=self._forget)
+        self._keys_by_user: Dict[str, Set[CacheKey]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(user_id: str, top_k_similar_users: int, top_k_items: int) -> CacheKey:
+        return (str(user_id), top_k_similar_users, top_k_items)
+
+    def get(self, key: CacheKey) -> Optional[List[Tuple[int, float]]]:
+        return self._entries.get(key)
+
+    def set(self, key: CacheKey, recommendations: List[Tuple[int, float]]):
+        with self._lock:
+            self._keys_by_user[key[0]].add(key)
+        self._entries.set(key, recommendations)
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached result for `user_id`."""
+        with self._lock:
+            keys = self._keys_by_user.pop(str(user_id), set())
+        for key in keys:
+            self._entries.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._keys_by_user.clear()
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _forget(self, key: CacheKey):
+        with self._lock:
+            keys = self._keys_by_user.get(key[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[key[0]]
@@ -0,0 +1,245 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+# loader(since) -> (rows, watermark)
+#   rows: iterable of (user_id, product_id) interactions observed after `since`;
+#         rows already seen may be returned again (they are ignored)
+#   watermark: timestamp to pass as `since` on the next call
+InteractionLoader = Callable[[Optional[datetime]], Tuple[Iterable[Tuple[str, int]], Optional[datetime]]]
+
+
+class CooccurrenceIndex:
+    """
+    Read-only top-M neighbour lists per product, stored CSR-style:
+    sorted product ids, row pointers, neighbour ids and scores.
+
+    Lookups are a binary search plus a slice, and the arrays can be saved
+    to a directory and loaded memory-mapped so worker processes share them.
+    """
+
+    _ARRAYS = ("items", "indptr", "neighbours", "scores")
+
+    def __init__(self, items=None, indptr=None, neighbours=None, scores=None, version: str = ""):
+        self.items = np.zeros(0, dtype=np.int64) if items is None else items
+        self.indptr = np.zeros(1, dtype=np.int64) if indptr is None else indptr
+        self.neighbours = np.zeros(0, dtype=np.int64) if neighbours is None else neighbours
+        self.scores = np.zeros(0, dtype=np.float32) if scores is None else scores
+        self.version = version
+
+    def similar(self, product_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """Top `k` (product_id, score) neighbours, best first."""
+        pos = int(np.searchsorted(self.items, product_id))
+        if pos >= len(self.items) or self.items[pos] != product_id:
+            return []
+        start, end = int(self.indptr[pos]), int(self.indptr[pos + 1])
+        end = min(end, start + k)
+        return list(zip(self.neighbours[start:end].tolist(), self.scores[start:end].tolist()))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def save(self, path: str, keep: int = 2):
+        """
+        Write a new version under `path` and point `path/CURRENT` at it.
+        The pointer is swapped atomically, so readers never see a partial write;
+        only the `keep` most recent versions are kept on disk.
+        """
+        version = str(time.time_ns())
+        target = os.path.join(path, version)
+        os.makedirs(target, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(target, f"{name}.npy"), getattr(self, name))
+
+        pointer = os.path.join(path, f"CURRENT.{os.getpid()}.tmp")
+        with open(pointer, "w") as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(path, "CURRENT"))
+        self.version = version
+
+        # Mapped files stay readable for processes that still hold them open
+        versions = sorted(name for name in os.listdir(path) if name.isdigit())
+        for old in versions[:-keep]:
+            old_dir = os.path.join(path, old)
+            for name in os.listdir(old_dir):
+                os.remove(os.path.join(old_dir, name))
+            os.rmdir(old_dir)
+
+    @staticmethod
+    def current_version(path: str) -> Optional[str]:
+        try:
+            with open(os.path.join(path, "CURRENT")) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Optional["CooccurrenceIndex"]:
+        """Load the current version saved under `path`, or None if there is none yet."""
+        version = cls.current_version(path)
+        if version is None:
+            return None
+        mmap_mode = "r" if mmap else None
+        arrays = [np.load(os.path.join(path, version, f"{name}.npy"), mmap_mode=mmap_mode) for name in cls._ARRAYS]
+        return cls(*arrays, version=version)
+
+
+class CooccurrenceEngine:
+    """
+    Item-to-item "bought / carted together" model.
+
+    Two products co-occur when the same user interacted with both. Counts are
+    updated incrementally from a loader that returns only interactions newer
+    than the last watermark. Scores are cosine-normalised co-occurrence
+    counts: c(i, j) / sqrt(n(i) * n(j)), with n the number of users per product,
+    so a refresh re-ranks the products it touched plus every product that
+    lists one of them as a neighbour, and splices those rows into the index.
+
+    The counts cover the whole interaction history, so only one process
+    should own the loader (app.jobs.build_cooccurrence): with `path` set it
+    publishes the index there after each refresh, and processes without a
+    loader memory-map it instead.
+    """
+
+    def __init__(
+        self,
+        loader: Optional[InteractionLoader] = None,
+        max_neighbours: int = 20,
+        path: Optional[str] = None
+    ):
+        """
+        Args:
+            loader: Source of new interactions (see InteractionLoader).
+            max_neighbours: Length of each stored neighbour list (M).
+            path: Directory the index is published to / loaded from.
+        """
+        self.loader = loader
+        self.max_neighbours = max_neighbours
+        self.path = path
+        self.index = CooccurrenceIndex()
+        self._baskets: Dict[str, Set[int]] = defaultdict(set)
+        self._users_per_item: Dict[int, int] = defaultdict(int)
+        self._pairs: Dict[int, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def similar(self, product_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """Products most often seen together with `product_id`."""
+        return self.index.similar(product_id, k)
+
+    def add(self, rows: Iterable[Tuple[str, int]]) -> bool:
+        """
+        Fold new (user_id, product_id) interactions in and re-rank touched products.
+        Returns whether the index changed.
+        """
+        with self._lock:
+            dirty: Set[int] = set()
+            counted: Set[int] = set()
+            for user_id, product_id in rows:
+                basket = self._baskets[str(user_id)]
+                if product_id in basket:
+                    continue
+                for other in basket:
+                    self._pairs[product_id][other] += 1
+                    self._pairs[other][product_id] += 1
+                    dirty.add(other)
+                basket.add(product_id)
+                self._users_per_item[product_id] += 1
+                counted.add(product_id)
+
+            # n(i) is part of every score involving i, so each product with i
+            # among its candidates has to be re-ranked as well
+            dirty |= counted
+            for product_id in counted:
+                dirty.update(self._pairs.get(product_id, ()))
+
+            if dirty:
+                self.index = self._splice({product_id: self._rank(product_id) for product_id in dirty})
+            return bool(dirty)
+
+    def refresh(self):
+        """Pull new interactions from the loader, or reload the published index."""
+        if self.loader is None:
+            if self.path and CooccurrenceIndex.current_version(self.path) not in (None, self.index.version):
+                self.index = CooccurrenceIndex.load(self.path)
+            return
+
+        rows, watermark = self.loader(self._watermark)
+        changed = self.add(rows)
+        if watermark is not None:
+            self._watermark = watermark
+        if changed and self.path:
+            self.index.save(self.path)
+
+    def start(self, interval: float = 300):
+        """Refresh now, then every `interval` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Co-occurrence refresh failed: {e}")
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Co-occurrence refresh failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="cooccurrence-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _rank(self, product_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        pairs = self._pairs.get(product_id)
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        neighbours = np.fromiter(pairs.keys(), dtype=np.int64, count=len(pairs))
+        counts = np.fromiter(pairs.values(), dtype=np.float64, count=len(pairs))
+        n_other = np.fromiter((self._users_per_item[j] for j in pairs), dtype=np.float64, count=len(pairs))
+        scores = counts / np.sqrt(n_other * self._users_per_item[product_id])
+
+        if len(scores) > self.max_neighbours:
+            top = np.argpartition(-scores, self.max_neighbours - 1)[:self.max_neighbours]
+            neighbours, scores = neighbours[top], scores[top]
+        order = np.lexsort((neighbours, -scores))
+        return neighbours[order], scores[order].astype(np.float32)
+
+    def _splice(self, rows: Dict[int, Tuple[np.ndarray, np.ndarray]]) -> CooccurrenceIndex:
+        """
+        Copy of the current index with `rows` replaced (empty ones dropped).
+        Unchanged rows are moved with array ops, never re-ranked.
+        """
+        old = self.index
+        changed = np.fromiter(rows, dtype=np.int64, count=len(rows))
+        keep = ~np.isin(old.items, changed)
+        new_items = sorted(product_id for product_id, (ids, _) in rows.items() if len(ids))
+        new_rows = [rows[product_id] for product_id in new_items]
+        new_lengths = np.fromiter((len(ids) for ids, _ in new_rows), dtype=np.int64, count=len(new_rows))
+
+        # Rows to emit, each as (start, length) into old entries followed by the new rows
+        items = np.concatenate([old.items[keep], np.array(new_items, dtype=np.int64)])
+        lengths = np.concatenate([np.diff(old.indptr)[keep], new_lengths])
+        starts = np.concatenate([old.indptr[:-1][keep], len(old.neighbours) + np.cumsum(new_lengths) - new_lengths])
+        neighbours = np.concatenate([old.neighbours] + [ids for ids, _ in new_rows]).astype(np.int64)
+        scores = np.concatenate([old.scores] + [values for _, values in new_rows]).astype(np.float32)
+
+        order = np.argsort(items, kind="stable")
+        items, lengths, starts = items[order], lengths[order], starts[order]
+        indptr = np.zeros(len(items) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        offsets = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return CooccurrenceIndex(items, indptr, neighbours[offsets], scores[offsets])
@@ -0,0 +1,60 @@
+import threading
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+# loader(watermark) -> (user_ids, watermark)
+#   user_ids: users whose vectors changed after `watermark` (all of them may be
+#             skipped when `watermark` is None, i.e. on the first call)
+#   watermark: opaque position to pass back on the next call
+InvalidationLoader = Callable[[Any], Tuple[Iterable[str], Any]]
+
+
+class InvalidationListener:
+    """
+    Applies user invalidations published by another process (the activity
+    vector updater) to a process-local recommendation cache.
+
+    The first refresh only records the current position: a process that has
+    just started has nothing cached yet.
+    """
+
+    def __init__(self, loader: InvalidationLoader, on_invalidate: Callable[[str], None]):
+        self.loader = loader
+        self.on_invalidate = on_invalidate
+        self._watermark: Any = None
+        self._started = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> int:
+        """Invalidate users changed since the last refresh; returns how many."""
+        user_ids, watermark = self.loader(self._watermark if self._started else None)
+        count = 0
+        if self._started:
+            for user_id in user_ids:
+                self.on_invalidate(user_id)
+                count += 1
+        self._watermark = watermark
+        self._started = True
+        return count
+
+    def start(self, interval: float = 5):
+        """Refresh now, then every `interval` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Recommendation invalidation refresh failed: {e}")
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Recommendation invalidation refresh failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="recommendation-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
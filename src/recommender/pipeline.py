@@ -0,0 +1,59 @@
+from typing import List, Dict, Optional, Tuple
+from src.recommender.aggregator import InteractionAggregator
+from src.recommender.cache import RecommendationCache
+from src.recommender.popularity import PopularityEngine
+
+
+class RecommendationPipeline:
+    """
+    The I/O-free half of a recommendation: cache lookups, neighbour
+    aggregation and the cold-start fallback.
+
+    Shared by SparseRecommender and AsyncSparseRecommender, which only differ
+    in how they fetch the user vector and its neighbours.
+    """
+
+    def __init__(
+        self,
+        top_k_similar_users: int = 5,
+        top_k_items: int = 10,
+        cache: Optional[RecommendationCache] = None,
+        fallback: Optional[PopularityEngine] = None
+    ):
+        self.top_k_similar_users = top_k_similar_users
+        self.top_k_items = top_k_items
+        self.aggregator = InteractionAggregator(mode="sum", engine="numpy")
+        self.cache = cache
+        # Serves cold-start users (missing from the vector store) instead of failing
+        self.fallback = fallback
+
+    def cached(self, user_id: str) -> Optional[List[Tuple[int, float]]]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self._key(user_id))
+
+    def finish(self, user_id: str, similar_users: List[Dict], user_interacted) -> List[Tuple[int, float]]:
+        """Aggregate neighbours into recommendations and cache the result."""
+        recommendations = self.aggregator.aggregate(
+            similar_users=similar_users,
+            exclude_indices=user_interacted,
+            top_k=self.top_k_items
+        )
+        return self.store(user_id, recommendations)
+
+    def cold_start(self, user_id: str) -> List[Tuple[int, float]]:
+        """Popularity-based recommendations for a user without a vector."""
+        if self.fallback is None:
+            return []
+        recommendations = self.fallback.top(self.top_k_items)
+        # Don't pin an empty result while the popularity engine is still loading
+        return self.store(user_id, recommendations) if recommendations else recommendations
+
+    def store(self, user_id: str, recommendations: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
+        """Cache `recommendations` for the user (no-op without a cache) and return them."""
+        if self.cache is not None:
+            self.cache.set(self._key(user_id), recommendations)
+        return recommendations
+
+    def _key(self, user_id: str):
+        return RecommendationCache.make_key(user_id, self.top_k_similar_users, self.top_k_items)
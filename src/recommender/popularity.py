@@ -0,0 +1,96 @@
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# loader(watermark) -> (rows, watermark)
+#   rows: complete iterable of (product_id, category, weight), or None when
+#         nothing changed since `watermark`
+#   watermark: opaque source version to pass back on the next call
+PopularityLoader = Callable[[Any], Tuple[Optional[Iterable[Tuple[int, str, float]]], Any]]
+
+
+class PopularityEngine:
+    """
+    In-memory popularity ranking, overall and per category.
+
+    Scores are replaced from a loader that re-aggregates its source whenever
+    the source changed since the last watermark (interactions are updated
+    and deleted in place, so they cannot simply be accumulated). Rankings
+    are rebuilt after each refresh, so `top` is a list slice.
+    """
+
+    def __init__(self, loader: Optional[PopularityLoader] = None, max_items: int = 100):
+        """
+        Args:
+            loader: Source of aggregated interactions (see PopularityLoader).
+            max_items: Length of each precomputed ranking.
+        """
+        self.loader = loader
+        self.max_items = max_items
+        self._scores: Dict[int, float] = defaultdict(float)
+        self._categories: Dict[int, str] = {}
+        self._watermark: Any = None
+        self._overall: List[Tuple[int, float]] = []
+        self._by_category: Dict[str, List[Tuple[int, float]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def top(self, k: int = 10, category: Optional[str] = None) -> List[Tuple[int, float]]:
+        """Most popular (product_id, score) pairs, optionally within a category."""
+        ranking = self._overall if category is None else self._by_category.get(category, [])
+        return ranking[:k]
+
+    def replace(self, rows: Iterable[Tuple[int, str, float]]):
+        """Swap in a complete set of scores and rebuild the rankings."""
+        scores: Dict[int, float] = defaultdict(float)
+        categories: Dict[int, str] = {}
+        for product_id, category, weight in rows:
+            scores[product_id] += weight
+            categories[product_id] = category
+        with self._lock:
+            self._scores = scores
+            self._categories = categories
+            self._rank()
+
+    def refresh(self):
+        """Reload the scores if the loader reports a change since the watermark."""
+        if self.loader is None:
+            return
+        rows, watermark = self.loader(self._watermark)
+        if rows is not None:
+            self.replace(rows)
+        self._watermark = watermark
+
+    def start(self, interval: float = 300):
+        """Refresh now, then every `interval` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Popularity refresh failed: {e}")
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Popularity refresh failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="popularity-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _rank(self):
+        ordered = sorted(self._scores.items(), key=lambda x: x[1], reverse=True)
+        by_category: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for product_id, score in ordered:
+            ranking = by_category[self._categories[product_id]]
+            if len(ranking) < self.max_items:
+                ranking.append((product_id, score))
+        # Swap in complete rankings so readers never see a partial rebuild
+        self._overall = ordered[:self.max_items]
+        self._by_category = dict(by_category)
@@ -1,18 +1,29 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from src.vectorstore.base import VectorStore
 from src.vectorstore.store import SparseClient
-from src.recommender.aggregator import InteractionAggregator
-
+from src.recommender.cache import RecommendationCache
+from src.recommender.pipeline import RecommendationPipeline
+from src.recommender.popularity import PopularityEngine
 
 class SparseRecommender:
     """
-    High-level recommender built on top of Qdrant Sparse Vectors.
+    High-level recommender built on top of sparse user vectors
+    (Qdrant by default, or any VectorStore backend).
     """
 
-    def __init__(self, top_k_similar_users: int = 5, top_k_items: int = 10):
-        self.client = SparseClient()
+    def __init__(
+        self,
+        top_k_similar_users: int = 5,
+        top_k_items: int = 10,
+        client: Optional[VectorStore] = None,
+        cache: Optional[RecommendationCache] = None,
+        fallback: Optional[PopularityEngine] = None
+    ):
+        # Prefer a shared client (see src.recommender.registry) over building one per instance
+        self.client = client if client is not None else SparseClient()
         self.top_k_similar_users = top_k_similar_users
         self.top_k_items = top_k_items
-        self.aggregator = InteractionAggregator(mode="sum")
+        self.pipeline = RecommendationPipeline(top_k_similar_users, top_k_items, cache=cache, fallback=fallback)
 
     def get_similar_users(self, user_id: str) -> List[Dict]:
         """Retrieve similar users from Qdrant."""
@@ -21,23 +32,94 @@ class SparseRecommender:
     def get_user_interactions(self, user_id: str) -> List[int]:
         """Retrieve indices (items) the user has interacted with."""
         user_data = self.client.get_point_by_id(user_id)
-        if not user_data:
+        if user_data is None:
             raise ValueError(f"User {user_id} not found in collection.")
         return user_data["indices"]
 
     def recommend(self, user_id: str):
         """
         Generate item recommendations for a user.
+        Results are served from `self.cache` when one is configured.
+
+        The user's vector is fetched first: a cold-start user is answered
+        from the popularity fallback after that single lookup, and a known
+        user's neighbours are searched with the fetched vector.
+        Vector store errors are raised, never served as a cold start.
         """
-        print(f"\nGenerating recommendations for user: {user_id}")
+        cached = self.pipeline.cached(user_id)
+        if cached is not None:
+            return cached
 
-        similar_users = self.get_similar_users(user_id)
-        user_interacted = self.get_user_interactions(user_id)
+        user_data = self.client.get_point_by_id(user_id)
+        if user_data is None:
+            if self.pipeline.fallback is not None:
+                return self.pipeline.cold_start(user_id)
+            raise ValueError(f"User {user_id} not found in collection.")
 
-        recommendations = self.aggregator.aggregate(
-            similar_users=similar_users,
-            exclude_indices=user_interacted,
-            top_k=self.top_k_items
+        similar_users = self.client.search_similar_by_vector(
+            indices=user_data["indices"],
+            values=user_data["values"],
+            top_k=self.top_k_similar_users,
+            exclude_id=user_id
         )
-        
-        return recommendations
+        return self.pipeline.finish(user_id, similar_users, user_data["indices"])
+
+    def recommend_for_vector(self, user_id: str, indices: List[int], values: List[float]):
+        """
+        Generate recommendations for a user whose sparse vector is already known
+        (e.g. from a scroll or batch retrieve). Costs one Qdrant query.
+        """
+        cached = self.pipeline.cached(user_id)
+        if cached is not None:
+            return cached
+
+        similar_users = self.client.search_similar_by_vector(
+            indices=indices,
+            values=values,
+            top_k=self.top_k_similar_users,
+            exclude_id=user_id
+        )
+        return self.pipeline.finish(user_id, similar_users, indices)
+
+    def recommend_many(self, user_ids: List[str], batch_size: int = 256) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        Generate recommendations for many users.
+
+        Each chunk of `batch_size` uncached users costs two Qdrant round trips:
+        one batch `retrieve` and one `query_batch_points` using the retrieved vectors.
+
+        Returns:
+            dict mapping user_id to its recommendations. Users missing from the
+            collection get the popularity fallback (an empty list without one).
+        """
+        results: Dict[str, List[Tuple[int, float]]] = {}
+        pending = []
+
+        for user_id in dict.fromkeys(str(u) for u in user_ids):
+            cached = self.pipeline.cached(user_id)
+            if cached is not None:
+                results[user_id] = cached
+            else:
+                pending.append(user_id)
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            users = self.client.get_points_by_ids(chunk)
+
+            for user_id in chunk:
+                if user_id not in users:
+                    results[user_id] = self.pipeline.cold_start(user_id)
+            results.update(self.recommend_for_points(list(users.values())))
+
+        return results
+
+    def recommend_for_points(self, points: List[Dict]) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        Generate recommendations for already-fetched points ({'id', 'indices', 'values'})
+        with a single `query_batch_points` round trip. Bypasses the cache lookup.
+        """
+        neighbours = self.client.search_similar_by_vectors_batch(points, top_k=self.top_k_similar_users)
+        return {
+            str(point["id"]): self.pipeline.finish(str(point["id"]), similar_users, point["indices"])
+            for point, similar_users in zip(points, neighbours)
+        }
@@ -0,0 +1,166 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from src.vectorstore.base import VectorStore
+from src.vectorstore.store import SparseClient
+from src.vectorstore.memory import InMemorySparseStore
+from src.vectorstore.maintenance import VectorMaintenance
+from src.recommender.recommender import SparseRecommender
+from src.recommender.cache import RecommendationCache
+from src.recommender.popularity import PopularityEngine
+from src.recommender.cooccurrence import CooccurrenceEngine
+
+
+# -----------------------------
+# Process-wide recommender registry
+# -----------------------------
+# Building a SparseClient opens a new Qdrant connection and performs a
+# `collection_exists` round trip, so it is done once per worker process
+# (or Lambda container) and shared by every request.
+
+_lock = threading.Lock()
+_client: Optional[VectorStore] = None
+_cache: Optional[RecommendationCache] = None
+_popularity: Optional[PopularityEngine] = None
+_cooccurrence: Optional[CooccurrenceEngine] = None
+_recommenders: Dict[Tuple[int, int], SparseRecommender] = {}
+
+# Upper bounds on caller-supplied settings: they size every search and each
+# distinct pair keeps its own recommender in _recommenders
+MAX_TOP_K_SIMILAR_USERS = int(os.getenv("RECOMMENDER_MAX_TOP_K_SIMILAR_USERS", 50))
+MAX_TOP_K_ITEMS = int(os.getenv("RECOMMENDER_MAX_TOP_K_ITEMS", 100))
+
+
+def get_sparse_client() -> VectorStore:
+    """
+    Return the shared vector store, creating it on first use.
+
+    VECTOR_STORE_BACKEND selects the backend: 'qdrant' (default) or 'memory',
+    which loads an InMemorySparseStore memory-mapped from VECTOR_STORE_PATH.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _build_vector_store()
+    return _client
+
+
+def _build_vector_store() -> VectorStore:
+    backend = os.getenv("VECTOR_STORE_BACKEND", "qdrant")
+    if backend == "memory":
+        path = os.getenv("VECTOR_STORE_PATH")
+        return InMemorySparseStore.load(path) if path else InMemorySparseStore()
+    if backend == "qdrant":
+        return SparseClient(maintenance=VectorMaintenance.from_env())
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND '{backend}'")
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """Return the shared recommendation result cache."""
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = RecommendationCache(
+                    maxsize=int(os.getenv("RECOMMENDATION_CACHE_SIZE", 10000)),
+                    ttl=float(os.getenv("RECOMMENDATION_CACHE_TTL", 300))
+                )
+    return _cache
+
+
+def get_popularity_engine() -> PopularityEngine:
+    """
+    Return the shared popularity engine used for cold-start users.
+    It starts empty; the app attaches a loader and starts refreshing it
+    (see app.services.popularity.start_popularity_engine).
+    """
+    global _popularity
+    if _popularity is None:
+        with _lock:
+            if _popularity is None:
+                _popularity = PopularityEngine(max_items=int(os.getenv("POPULARITY_MAX_ITEMS", 100)))
+    return _popularity
+
+
+def get_cooccurrence_engine() -> CooccurrenceEngine:
+    """
+    Return the shared item-to-item engine behind "similar products".
+    With COOCCURRENCE_PATH set it serves the index published there by
+    app.jobs.build_cooccurrence (memory-mapped); otherwise it stays empty
+    (see app.services.cooccurrence.start_cooccurrence_engine).
+    """
+    global _cooccurrence
+    if _cooccurrence is None:
+        with _lock:
+            if _cooccurrence is None:
+                _cooccurrence = CooccurrenceEngine(
+                    max_neighbours=int(os.getenv("COOCCURRENCE_MAX_NEIGHBOURS", 20)),
+                    path=os.getenv("COOCCURRENCE_PATH") or None
+                )
+    return _cooccurrence
+
+
+def invalidate_user_recommendations(user_id: str):
+    """
+    Forget cached recommendations for a user whose interactions changed.
+    Only affects this process; workers learn about changes made by the
+    activity updater via app.services.recommendation.start_recommendation_invalidation.
+    """
+    if _cache is not None:
+        _cache.invalidate_user(user_id)
+
+
+def get_recommender(top_k_similar_users: int = 5, top_k_items: int = 10) -> SparseRecommender:
+    """
+    Return the shared SparseRecommender for the given settings, clamped to
+    1..MAX_TOP_K_SIMILAR_USERS and 1..MAX_TOP_K_ITEMS.
+    """
+    top_k_similar_users = max(1, min(int(top_k_similar_users), MAX_TOP_K_SIMILAR_USERS))
+    top_k_items = max(1, min(int(top_k_items), MAX_TOP_K_ITEMS))
+    key = (top_k_similar_users, top_k_items)
+    recommender = _recommenders.get(key)
+    if recommender is None:
+        client = get_sparse_client()
+        cache = get_recommendation_cache()
+        fallback = get_popularity_engine()
+        with _lock:
+            recommender = _recommenders.get(key)
+            if recommender is None:
+                recommender = SparseRecommender(
+                    top_k_similar_users=top_k_similar_users,
+                    top_k_items=top_k_items,
+                    client=client,
+                    cache=cache,
+                    fallback=fallback
+                )
+                _recommenders[key] = recommender
+    return recommender
+
+
+def warm_up() -> bool:
+    """
+    Eagerly create the shared client so the first request does not pay
+    the connection and collection check cost. Never raises.
+    """
+    try:
+        get_sparse_client()
+        return True
+    except Exception as e:
+        print(f"Recommender warm-up failed: {e}")
+        return False
+
+
+def reset():
+    """Drop shared instances (e.g. after fork, or in tests)."""
+    global _client, _cache, _popularity, _cooccurrence
+    with _lock:
+        if _popularity is not None:
+            _popularity.stop()
+        if _cooccurrence is not None:
+            _cooccurrence.stop()
+        _client = None
+        _cache = None
+        _popularity = None
+        _cooccurrence = None
+        _recommenders.clear()
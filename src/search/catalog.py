@@ -0,0 +1,200 @@
+import bisect
+import heapq
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# loader(since) -> iterable of product dicts (Product.to_dict()) updated at or after `since`
+CatalogLoader = Callable[[Optional[datetime]], Iterable[Dict[str, Any]]]
+
+_TOKEN = re.compile(r"\w+")
+INDEXED_FIELDS = ("name", "description", "category", "type")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class CatalogIndex:
+    """
+    In-memory inverted index over the product catalog.
+
+    Every query term is matched as a prefix of an indexed word (name,
+    description, category, type), terms are ANDed, and hits are returned
+    newest first like the database listing. The vocabulary is kept sorted so
+    a prefix resolves to a contiguous range with two binary searches.
+
+    Products are upserted one by one (e.g. from create_product) or pulled
+    incrementally from a loader keyed on `updated_at`.
+    """
+
+    def __init__(self, loader: Optional[CatalogLoader] = None):
+        self.loader = loader
+        self._products: Dict[int, Dict[str, Any]] = {}
+        self._sort_keys: Dict[int, Tuple[str, int]] = {}
+        self._tokens: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._by_category: Dict[str, Set[int]] = {}
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ready = False
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def add(self, product: Dict[str, Any]):
+        """Insert or replace one product (a Product.to_dict() dict)."""
+        with self._lock:
+            for token in self._index(product):
+                bisect.insort(self._vocabulary, token)
+
+    def refresh(self) -> int:
+        """Pull products updated since the last refresh; returns how many were indexed."""
+        if self.loader is None:
+            return 0
+        count = 0
+        watermark = self._watermark
+        # New words are merged into the sorted vocabulary once at the end:
+        # inserting them one by one makes a full build quadratic
+        new_tokens: Set[str] = set()
+        for product in self.loader(self._watermark):
+            with self._lock:
+                new_tokens.update(self._index(product))
+            count += 1
+            updated_at = product.get("updated_at")
+            if updated_at:
+                updated_at = datetime.fromisoformat(updated_at)
+                if watermark is None or updated_at > watermark:
+                    watermark = updated_at
+        with self._lock:
+            pending = sorted(token for token in new_tokens if token in self._postings)
+            self._vocabulary = list(heapq.merge(self._vocabulary, pending))
+        self._watermark = watermark
+        self.ready = True
+        return count
+
+    def start(self, interval: float = 60):
+        """Build now, then poll for updated products every `interval` seconds."""
+        if self._thread is not None:
+            return
+        try:
+            print(f"Catalog index built with {self.refresh()} products")
+        except Exception as e:
+            print(f"Catalog index refresh failed: {e}")
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Catalog index refresh failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="catalog-index-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 6,
+        exclude_ids: Optional[Iterable[int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Same response shape and counting as app.services.product.get_products:
+        'total_items' includes excluded IDs, and a query without any word
+        (e.g. only punctuation) matches nothing. Raises ValueError for page < 1.
+        """
+        if page < 1:
+            raise ValueError("page must be at least 1")
+        terms = tokenize(query)
+        with self._lock:
+            if query and not terms:
+                hits = set()
+            elif category and category.lower() != "all":
+                hits = set(self._by_category.get(category, ()))
+            else:
+                hits = None
+
+            for term in terms:
+                matches = self._prefix_matches(term)
+                hits = matches if hits is None else hits & matches
+                if not hits:
+                    break
+            if hits is None:
+                hits = set(self._products)
+
+            total_items = len(hits)
+            if exclude_ids:
+                hits = hits - set(exclude_ids)
+            # Only the rows up to the requested page are ordered, not every hit
+            start = (page - 1) * per_page
+            ordered = heapq.nlargest(start + per_page, hits, key=self._sort_keys.__getitem__)
+            products = [self._products[product_id] for product_id in ordered[start:]]
+
+        return {
+            'products': products,
+            'total_pages': (total_items + per_page - 1) // per_page,
+            'current_page': page,
+            'total_items': total_items
+        }
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff", lo=start)
+        matches: Set[int] = set()
+        for token in self._vocabulary[start:end]:
+            matches |= self._postings[token]
+        return matches
+
+    def _index(self, product: Dict[str, Any]) -> List[str]:
+        """
+        Insert or replace `product` in every structure but the vocabulary;
+        returns its words that are new to the vocabulary.
+        """
+        product_id = product["id"]
+        tokens = {token for field in INDEXED_FIELDS for token in tokenize(product.get(field))}
+        self._remove(product_id)
+        self._products[product_id] = product
+        self._sort_keys[product_id] = (product.get("created_at") or "", product_id)
+        self._tokens[product_id] = tokens
+        new_tokens = []
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                new_tokens.append(token)
+            postings.add(product_id)
+        self._by_category.setdefault(product.get("category"), set()).add(product_id)
+        return new_tokens
+
+    def _remove(self, product_id: int):
+        previous = self._products.pop(product_id, None)
+        if previous is None:
+            return
+        self._sort_keys.pop(product_id, None)
+        for token in self._tokens.pop(product_id, ()):
+            postings = self._postings[token]
+            postings.discard(product_id)
+            if not postings:
+                del self._postings[token]
+                # Words added by a refresh in progress are not in the vocabulary yet
+                pos = bisect.bisect_left(self._vocabulary, token)
+                if pos < len(self._vocabulary) and self._vocabulary[pos] == token:
+                    del self._vocabulary[pos]
+        category = self._by_category.get(previous.get("category"))
+        if category is not None:
+            category.discard(product_id)
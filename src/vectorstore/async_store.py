@@ -0,0 +1,132 @@
+import os
+from typing import List, Dict, Any, Optional
+from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http import models as rest_models
+from src.vectorstore.connection import qdrant_client_kwargs
+from src.vectorstore.store import exclude_filter
+from src.vectorstore.vector import SparsePoint, as_list
+
+
+class AsyncSparseClient:
+    """
+    Async counterpart of SparseClient for the read path, built on AsyncQdrantClient.
+
+    The underlying HTTP pool is bound to the event loop it is first used on,
+    so create one instance per loop (e.g. at worker start-up) and reuse it.
+    """
+
+    def __init__(self, client: Optional[AsyncQdrantClient] = None):
+        self.sparse_name = os.getenv('QDRANT_SPARSE_NAME', 'sparse')
+        self.collection_name = os.getenv('QDRANT_COLLECTION_NAME', 'sparse_collection')
+
+        if client is None:
+            client = AsyncQdrantClient(**qdrant_client_kwargs(asynchronous=True))
+        self.client = client
+
+    @classmethod
+    async def create(cls, client: Optional[AsyncQdrantClient] = None) -> "AsyncSparseClient":
+        """Build a client and make sure the collection exists."""
+        store = cls(client)
+        await store.ensure_collection()
+        return store
+
+    async def ensure_collection(self):
+        """Check or create the sparse collection."""
+        if not await self.client.collection_exists(collection_name=self.collection_name):
+            await self.client.create_collection(
+                collection_name=self.collection_name,
+                sparse_vectors_config={
+                    self.sparse_name: models.SparseVectorParams(
+                        index=models.SparseIndexParams(on_disk=False)
+                    )
+                }
+            )
+
+    async def close(self):
+        await self.client.close()
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    async def get_point_by_id(self, point_id: str) -> Optional[SparsePoint]:
+        """
+        Retrieve a point by its ID, or None if it does not exist.
+        Transport and server errors are raised, not reported as a missing point.
+        """
+        points = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[point_id],
+            with_vectors=True
+        )
+        return self._to_sparse_point(points[0]) if points else None
+
+    async def get_points_by_ids(self, point_ids: List[str]) -> Dict[str, SparsePoint]:
+        """Retrieve many points in a single round trip."""
+        if not point_ids:
+            return {}
+        points = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(point_ids),
+            with_vectors=True
+        )
+        return {str(point.id): self._to_sparse_point(point) for point in points}
+
+    async def search_similar_by_id(self, point_id: str, top_k: int = 5) -> List[SparsePoint]:
+        """Search for points similar to a stored point (the point itself is excluded)."""
+        response = await self.client.query_points(
+            collection_name=self.collection_name,
+            using=self.sparse_name,
+            query=point_id,
+            limit=top_k,
+            with_vectors=True
+        )
+        return [self._to_sparse_point(hit) for hit in response.points]
+
+    async def search_similar_by_vector(
+        self,
+        indices: List[int],
+        values: List[float],
+        top_k: int = 5,
+        exclude_id: Optional[str] = None,
+    ) -> List[SparsePoint]:
+        """Search for points similar to an already-fetched sparse vector."""
+        response = await self.client.query_points(
+            collection_name=self.collection_name,
+            using=self.sparse_name,
+            query=rest_models.SparseVector(indices=as_list(indices), values=as_list(values)),
+            query_filter=self._exclude_filter(exclude_id),
+            limit=top_k,
+            with_vectors=True
+        )
+        return [self._to_sparse_point(hit) for hit in response.points]
+
+    async def search_similar_by_vectors_batch(
+        self,
+        points: List[Dict[str, Any]],
+        top_k: int = 5,
+    ) -> List[List[SparsePoint]]:
+        """Search neighbours for many already-fetched points in a single round trip."""
+        if not points:
+            return []
+        requests = [
+            rest_models.QueryRequest(
+                query=rest_models.SparseVector(indices=as_list(point["indices"]), values=as_list(point["values"])),
+                using=self.sparse_name,
+                filter=self._exclude_filter(point.get("id")),
+                limit=top_k,
+                with_vector=True
+            )
+            for point in points
+        ]
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        return [[self._to_sparse_point(hit) for hit in response.points] for response in responses]
+
+    @staticmethod
+    def _exclude_filter(point_id: Optional[str]) -> Optional[rest_models.Filter]:
+        return exclude_filter(point_id)
+
+    def _to_sparse_point(self, point) -> SparsePoint:
+        return SparsePoint.from_qdrant(point, self.sparse_name)
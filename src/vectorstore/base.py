@@ -0,0 +1,105 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from src.vectorstore.vector import SparsePoint
+
+
+@dataclass
+class BatchFailure:
+    batch_index: int
+    point_ids: List[str]
+    error: str
+
+
+@dataclass
+class BulkUpsertReport:
+    """Outcome of `insert_sparse_points_bulk`."""
+    inserted: int = 0
+    batches: int = 0
+    failed: List[BatchFailure] = field(default_factory=list)
+    # Only filled when the caller asks for IDs (collect_ids=True)
+    point_ids: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+class VectorStore(ABC):
+    """
+    Interface shared by the sparse user-vector backends.
+
+    Points are read back as SparsePoint objects and written as dicts; both
+    expose 'id', 'indices' and 'values' by key.
+    Backends only need the single-point operations; the batch methods
+    fall back to looping over them and can be overridden when the
+    backend has a cheaper native form.
+    """
+
+    @abstractmethod
+    def insert_sparse_point(
+        self,
+        indices: List[int],
+        values: List[float],
+        payload: Optional[Dict[str, Any]] = None,
+        point_id: Optional[str] = None
+    ) -> str:
+        """Insert or replace a single sparse vector point."""
+
+    @abstractmethod
+    def insert_sparse_points_bulk(
+        self,
+        vectors: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+        collect_ids: bool = False,
+        **kwargs
+    ) -> BulkUpsertReport:
+        """Insert or replace many sparse vector points, from any iterable."""
+
+    @abstractmethod
+    def get_point_by_id(self, point_id: str) -> Optional[SparsePoint]:
+        """Return {'id', 'indices', 'values'} for a point, or None if missing."""
+
+    @abstractmethod
+    def search_similar_by_id(self, point_id: str, top_k: int = 5) -> List[SparsePoint]:
+        """Return the top_k points most similar to a stored point, excluding it."""
+
+    @abstractmethod
+    def search_similar_by_vector(
+        self,
+        indices: List[int],
+        values: List[float],
+        top_k: int = 5,
+        exclude_id: Optional[str] = None,
+    ) -> List[SparsePoint]:
+        """Return the top_k points most similar to a sparse vector."""
+
+    @abstractmethod
+    def scroll_points(self, page_size: int = 256, with_payload: bool = False) -> Iterator[List[SparsePoint]]:
+        """Yield every stored point, page by page."""
+
+    def get_points_by_ids(self, point_ids: List[str], with_payload: bool = False) -> Dict[str, SparsePoint]:
+        """Return a dict of found point ID (as str) -> point. Backends may omit payloads."""
+        points = {}
+        for point_id in point_ids:
+            point = self.get_point_by_id(point_id)
+            if point is not None:
+                points[str(point["id"])] = point
+        return points
+
+    def search_similar_batch(self, point_ids: List[str], top_k: int = 5) -> List[List[SparsePoint]]:
+        """One neighbour list per stored reference point, in order."""
+        return [self.search_similar_by_id(point_id, top_k=top_k) for point_id in point_ids]
+
+    def search_similar_by_vectors_batch(
+        self,
+        points: List[Dict[str, Any]],
+        top_k: int = 5,
+    ) -> List[List[SparsePoint]]:
+        """One neighbour list per query point, each excluding the point's own ID."""
+        return [
+            self.search_similar_by_vector(
+                point["indices"], point["values"], top_k=top_k, exclude_id=point.get("id")
+            )
+            for point in points
+        ]
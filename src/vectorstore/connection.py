@@ -0,0 +1,74 @@
+import json
+import os
+from typing import Any, Dict
+import httpx
+
+# gRPC status codes worth retrying: the server or a proxy was briefly unreachable
+RETRYABLE_GRPC_CODES = ["UNAVAILABLE", "RESOURCE_EXHAUSTED"]
+
+
+def qdrant_client_kwargs(asynchronous: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for QdrantClient / AsyncQdrantClient built from the environment.
+
+    - QDRANT_URL, QDRANT_API_KEY: endpoint and credentials (URL is required)
+    - QDRANT_TRANSPORT: 'rest' (default) or 'grpc'. gRPC sends sparse vectors
+      as protobuf instead of JSON, which is cheaper for `with_vectors` reads.
+    - QDRANT_GRPC_PORT: gRPC port (default 6334)
+    - QDRANT_TIMEOUT: per-request timeout in seconds (default 10)
+    - QDRANT_POOL_SIZE, QDRANT_KEEPALIVE_SECONDS: REST keep-alive pool; the
+      gRPC channel is a single multiplexed connection kept alive by pings
+    - QDRANT_RETRIES: retries of connection failures (REST) or of
+      UNAVAILABLE / RESOURCE_EXHAUSTED calls with backoff (gRPC)
+    """
+    qdrant_url = os.getenv('QDRANT_URL')
+    if not qdrant_url:
+        raise ValueError("QDRANT_URL must be set in environment")
+
+    transport = os.getenv('QDRANT_TRANSPORT', 'rest').lower()
+    if transport not in ('rest', 'grpc'):
+        raise ValueError(f"Unknown QDRANT_TRANSPORT '{transport}'")
+
+    pool_size = int(os.getenv('QDRANT_POOL_SIZE', 10))
+    keepalive = float(os.getenv('QDRANT_KEEPALIVE_SECONDS', 60))
+    retries = int(os.getenv('QDRANT_RETRIES', 3))
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=keepalive,
+    )
+    transport_cls = httpx.AsyncHTTPTransport if asynchronous else httpx.HTTPTransport
+
+    return {
+        'url': qdrant_url,
+        'api_key': os.getenv('QDRANT_API_KEY'),
+        'timeout': float(os.getenv('QDRANT_TIMEOUT', 10)),
+        'prefer_grpc': transport == 'grpc',
+        'grpc_port': int(os.getenv('QDRANT_GRPC_PORT', 6334)),
+        'grpc_options': _grpc_options(retries, keepalive),
+        # REST is still used by a few calls in gRPC mode, so it is always configured
+        'transport': transport_cls(limits=limits, retries=retries),
+    }
+
+
+def _grpc_options(retries: int, keepalive: float) -> Dict[str, Any]:
+    service_config = {
+        "methodConfig": [{
+            "name": [{}],
+            "retryPolicy": {
+                "maxAttempts": min(retries + 1, 5),  # gRPC caps attempts at 5
+                "initialBackoff": "0.1s",
+                "maxBackoff": "2s",
+                "backoffMultiplier": 2,
+                "retryableStatusCodes": RETRYABLE_GRPC_CODES,
+            },
+        }]
+    } if retries > 0 else {"methodConfig": []}
+
+    return {
+        "grpc.enable_retries": 1 if retries > 0 else 0,
+        "grpc.service_config": json.dumps(service_config),
+        "grpc.keepalive_time_ms": int(keepalive * 1000),
+        "grpc.keepalive_permit_without_calls": 1,
+        "grpc.max_receive_message_length": 64 * 1024 * 1024,
+    }
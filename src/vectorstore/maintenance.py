@@ -0,0 +1,122 @@
+import os
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple
+import numpy as np
+from src.vectorstore.base import BulkUpsertReport, VectorStore
+
+
+class VectorMaintenance:
+    """
+    Keeps user vectors bounded so sparse queries stay cheap.
+
+    - Time decay: weights are halved every `half_life_days`, measured from the
+      point's payload 'updated_at' (the moment its weights were last rescaled).
+    - Pruning: only the `max_entries` heaviest items are kept, and entries
+      decayed below `min_weight` are dropped.
+
+    Applied online by the writers (SparseClient upserts, the activity updater)
+    and offline by `compact` over the whole collection. Decay is measured
+    from 'updated_at', so a point that a writer has just decayed and stamped
+    is not decayed a second time when it is stored.
+    """
+
+    def __init__(
+        self,
+        half_life_days: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        min_weight: float = 1e-3
+    ):
+        self.half_life_days = half_life_days
+        self.max_entries = max_entries
+        self.min_weight = min_weight
+
+    @classmethod
+    def from_env(cls) -> Optional["VectorMaintenance"]:
+        """Build from VECTOR_DECAY_HALF_LIFE_DAYS / VECTOR_MAX_ENTRIES; None if neither is set."""
+        half_life = os.getenv("VECTOR_DECAY_HALF_LIFE_DAYS")
+        max_entries = os.getenv("VECTOR_MAX_ENTRIES")
+        if not half_life and not max_entries:
+            return None
+        return cls(
+            half_life_days=float(half_life) if half_life else None,
+            max_entries=int(max_entries) if max_entries else None,
+            min_weight=float(os.getenv("VECTOR_MIN_WEIGHT", 1e-3)),
+        )
+
+    # -----------------------------
+    # Single vector operations
+    # -----------------------------
+    def decay(self, values, updated_at: Optional[str], now: datetime) -> np.ndarray:
+        """Scale weights by the time elapsed since `updated_at` (ISO string)."""
+        values = np.asarray(values, dtype=np.float32)
+        if not self.half_life_days or not updated_at:
+            return values
+        try:
+            elapsed_days = (now - datetime.fromisoformat(updated_at)).total_seconds() / 86400
+        except (TypeError, ValueError):
+            return values
+        if elapsed_days <= 0:
+            return values
+        return values * np.float32(0.5 ** (elapsed_days / self.half_life_days))
+
+    def prune(self, indices, values) -> Tuple[np.ndarray, np.ndarray]:
+        """Drop negligible entries and keep at most `max_entries` of the heaviest."""
+        indices = np.asarray(indices, dtype=np.int32)
+        values = np.asarray(values, dtype=np.float32)
+
+        keep = values >= self.min_weight
+        if not keep.all():
+            indices, values = indices[keep], values[keep]
+
+        if self.max_entries is not None and values.size > self.max_entries:
+            top = np.argpartition(values, values.size - self.max_entries)[values.size - self.max_entries:]
+            top.sort()
+            indices, values = indices[top], values[top]
+        return indices, values
+
+    def apply(self, point: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Decay and prune a point ({'id', 'indices', 'values', optional 'payload'}).
+        Returns a new dict with payload 'updated_at' set to `now`.
+        """
+        now = now or datetime.utcnow()
+        payload = dict(point.get("payload") or {})
+        values = self.decay(point["values"], payload.get("updated_at"), now)
+        indices, values = self.prune(point["indices"], values)
+        payload["updated_at"] = now.isoformat()
+        return {"id": point["id"], "indices": indices, "values": values, "payload": payload}
+
+    # -----------------------------
+    # Offline compaction
+    # -----------------------------
+    def compact(
+        self,
+        store: VectorStore,
+        page_size: int = 256,
+        batch_size: int = 256,
+        max_workers: int = 1,
+        lock: Optional[Callable[[], ContextManager]] = None
+    ) -> BulkUpsertReport:
+        """
+        Decay and prune every point of `store`, one scrolled page at a time.
+
+        The activity updater read-modify-writes the same points. Pass the lock
+        it runs under as `lock`: each page is then re-read and written back
+        while holding it, so no concurrently applied activity is overwritten.
+        Without a lock, stop the consumer for the duration of the compaction.
+        """
+        report = BulkUpsertReport()
+        for page in store.scroll_points(page_size=page_size):
+            with lock() if lock is not None else nullcontext():
+                now = datetime.utcnow()
+                current = store.get_points_by_ids([point["id"] for point in page], with_payload=True)
+                page_report = store.insert_sparse_points_bulk(
+                    (self.apply(point, now) for point in current.values()),
+                    batch_size=batch_size,
+                    max_workers=max_workers
+                )
+            report.inserted += page_report.inserted
+            report.batches += page_report.batches
+            report.failed.extend(page_report.failed)
+        return report
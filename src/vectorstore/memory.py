@@ -0,0 +1,353 @@
+import json
+import os
+import threading
+import uuid
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from src.vectorstore.base import BulkUpsertReport, VectorStore
+from src.vectorstore.vector import SparsePoint
+
+
+class InMemorySparseStore(VectorStore):
+    """
+    In-process sparse vector store.
+
+    User vectors are held as a CSR matrix (rows = users, columns = item ids)
+    plus an inverted index (item -> users, i.e. the CSC transpose), so a
+    similarity query only touches users sharing at least one item with the
+    query. Scores are dot products, as with Qdrant sparse vectors.
+
+    The arrays can be saved to a directory and loaded back memory-mapped,
+    letting several worker processes share one read-only copy. Writes are
+    kept in the writing process only: new and replaced points sit in a small
+    delta that reads consult next to the arrays, and are folded into the
+    arrays once `max_pending` of them have accumulated.
+    """
+
+    _ARRAYS = ("indptr", "indices", "values", "items", "item_indptr", "item_rows", "item_values")
+
+    def __init__(self, max_pending: int = 1024):
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._set_arrays(*self._build_arrays([]))
+        # Row overrides written since the arrays were last built
+        self._pending: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Concatenated form of _pending for scoring, built on first use after a write
+        self._pending_index = None
+        self.max_pending = max_pending
+
+    # -----------------------------
+    # Construction / persistence
+    # -----------------------------
+    @classmethod
+    def from_points(cls, points: Iterable[Dict[str, Any]]) -> "InMemorySparseStore":
+        """Build a store from an iterable of {'id', 'indices', 'values', optional 'payload'}."""
+        store = cls()
+        store.insert_sparse_points_bulk(points)
+        store._rebuild()
+        return store
+
+    @classmethod
+    def from_store(cls, source: VectorStore, page_size: int = 1024) -> "InMemorySparseStore":
+        """Copy every point of another backend (e.g. the Qdrant collection)."""
+        return cls.from_points(
+            point for page in source.scroll_points(page_size=page_size, with_payload=True) for point in page
+        )
+
+    def save(self, path: str):
+        """Write the store to `path` (a directory) as .npy arrays plus JSON metadata."""
+        with self._lock:
+            self._rebuild()
+            os.makedirs(path, exist_ok=True)
+            for name in self._ARRAYS:
+                np.save(os.path.join(path, f"{name}.npy"), getattr(self, f"_{name}"))
+            with open(os.path.join(path, "ids.json"), "w") as f:
+                json.dump({"ids": self._ids, "payloads": self._payloads}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "InMemorySparseStore":
+        """Load a store saved with `save`, memory-mapping the arrays by default."""
+        store = cls()
+        mmap_mode = "r" if mmap else None
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in cls._ARRAYS]
+        with open(os.path.join(path, "ids.json")) as f:
+            meta = json.load(f)
+        store._ids = meta["ids"]
+        store._row_by_id = {point_id: row for row, point_id in enumerate(store._ids)}
+        store._payloads = meta.get("payloads", {})
+        store._set_arrays(*arrays)
+        return store
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def insert_sparse_point(
+        self,
+        indices: List[int],
+        values: List[float],
+        payload: Optional[Dict[str, Any]] = None,
+        point_id: Optional[str] = None
+    ) -> str:
+        """Insert or replace a single sparse vector point"""
+        return self.insert_sparse_points_bulk(
+            [{"id": point_id, "indices": indices, "values": values, "payload": payload}],
+            collect_ids=True
+        ).point_ids[0]
+
+    def insert_sparse_points_bulk(
+        self,
+        vectors: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+        collect_ids: bool = False,
+        **kwargs
+    ) -> BulkUpsertReport:
+        """
+        Insert or replace many sparse vector points.
+        Writes are local, so batching and concurrency options are accepted but unused.
+        """
+        report = BulkUpsertReport(batches=1)
+        with self._lock:
+            for vec in vectors:
+                indices = np.asarray(vec["indices"], dtype=np.int32)
+                values = np.asarray(vec["values"], dtype=np.float32)
+                if len(indices) != len(values):
+                    raise ValueError("Indices and values must have the same length")
+
+                point_id = str(uuid.uuid4() if vec.get("id") is None else vec["id"])
+                self._pending[point_id] = (indices, values)
+                self._pending_index = None
+                if vec.get("payload") is not None:
+                    self._payloads[point_id] = vec["payload"]
+                report.inserted += 1
+                if collect_ids:
+                    report.point_ids.append(point_id)
+            # Amortised: one full rebuild per max_pending writes
+            if len(self._pending) >= self.max_pending:
+                self._rebuild()
+        return report
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def get_point_by_id(self, point_id: str) -> Optional[SparsePoint]:
+        with self._lock:
+            return self._lookup(str(point_id))
+
+    def get_points_by_ids(self, point_ids: List[str], with_payload: bool = False) -> Dict[str, SparsePoint]:
+        points = {}
+        with self._lock:
+            for point_id in map(str, point_ids):
+                point = self._lookup(point_id)
+                if point is None:
+                    continue
+                if with_payload:
+                    point["payload"] = self._payloads.get(point_id)
+                points[point_id] = point
+        return points
+
+    def search_similar_by_id(self, point_id: str, top_k: int = 5) -> List[SparsePoint]:
+        point = self.get_point_by_id(point_id)
+        if point is None:
+            raise ValueError(f"Point {point_id} not found")
+        return self.search_similar_by_vector(point["indices"], point["values"], top_k=top_k, exclude_id=point_id)
+
+    def search_similar_by_vector(
+        self,
+        indices: List[int],
+        values: List[float],
+        top_k: int = 5,
+        exclude_id: Optional[str] = None,
+    ) -> List[SparsePoint]:
+        with self._lock:
+            if top_k <= 0:
+                return []
+            q_indices = np.asarray(indices, dtype=np.int64)
+            q_values = np.asarray(values, dtype=np.float32)
+            pending_ids, pending_scores, shadowed_rows = self._pending_scores(q_indices, q_values)
+
+            scores = self._scores(q_indices, q_values)
+            # Rows replaced by a pending write are scored from the delta instead
+            scores[shadowed_rows] = 0.0
+            if exclude_id is not None:
+                exclude_row = self._row_by_id.get(str(exclude_id))
+                if exclude_row is not None:
+                    scores[exclude_row] = 0.0
+                if str(exclude_id) in self._pending:
+                    pending_scores[pending_ids.index(str(exclude_id))] = 0.0
+
+            results = [(scores[row], self._point(row)) for row in self._top(scores, top_k)]
+            results += [
+                (pending_scores[n], self._pending_point(pending_ids[n])) for n in self._top(pending_scores, top_k)
+            ]
+            results.sort(key=lambda result: -result[0])
+            return [point for _, point in results[:top_k]]
+
+    def scroll_points(self, page_size: int = 256, with_payload: bool = False) -> Iterator[List[SparsePoint]]:
+        # Page over a snapshot taken under the lock: a concurrent rebuild swaps
+        # the arrays and renumbers rows, but never mutates the ones captured here
+        with self._lock:
+            indptr, indices, values = self._indptr, self._indices, self._values
+            ids, pending, payloads = self._ids, dict(self._pending), dict(self._payloads)
+
+        def points():
+            for row, point_id in enumerate(ids):
+                if point_id not in pending:
+                    start, end = indptr[row], indptr[row + 1]
+                    yield SparsePoint(point_id, indices[start:end], values[start:end])
+            for point_id, (point_indices, point_values) in pending.items():
+                yield SparsePoint(point_id, point_indices, point_values)
+
+        page = []
+        for point in points():
+            if with_payload:
+                point["payload"] = payloads.get(point["id"])
+            page.append(point)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids) + sum(1 for point_id in self._pending if point_id not in self._row_by_id)
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+    def _point(self, row: int) -> SparsePoint:
+        # Slices are views into the (possibly memory-mapped) arrays, not copies
+        start, end = self._indptr[row], self._indptr[row + 1]
+        return SparsePoint(self._ids[row], self._indices[start:end], self._values[start:end])
+
+    def _pending_point(self, point_id: str) -> SparsePoint:
+        indices, values = self._pending[point_id]
+        return SparsePoint(point_id, indices, values)
+
+    def _lookup(self, point_id: str) -> Optional[SparsePoint]:
+        if point_id in self._pending:
+            return self._pending_point(point_id)
+        row = self._row_by_id.get(point_id)
+        return None if row is None else self._point(row)
+
+    @staticmethod
+    def _top(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Positions of the top_k positive scores, best first."""
+        # Only users sharing at least one item are results, as in Qdrant
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > top_k:
+            top = np.argpartition(scores[candidates], candidates.size - top_k)[candidates.size - top_k:]
+            candidates = candidates[top]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def _pending_scores(self, q_indices: np.ndarray, q_values: np.ndarray):
+        """
+        Dot product of the query against every pending point.
+        Returns (pending ids, their scores, array rows those points replace).
+        """
+        if self._pending_index is None:
+            ids = list(self._pending)
+            rows = [self._pending[point_id] for point_id in ids]
+            lengths = np.fromiter((len(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+            owners = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+            indices = np.concatenate([r[0] for r in rows]).astype(np.int64) if rows else np.zeros(0, np.int64)
+            values = np.concatenate([r[1] for r in rows]).astype(np.float32) if rows else np.zeros(0, np.float32)
+            shadowed = np.fromiter(
+                (self._row_by_id[point_id] for point_id in ids if point_id in self._row_by_id), dtype=np.int64
+            )
+            self._pending_index = (ids, owners, indices, values, shadowed)
+
+        ids, owners, indices, values, shadowed = self._pending_index
+        scores = np.zeros(len(ids), dtype=np.float32)
+        if q_indices.size == 0 or indices.size == 0:
+            return ids, scores, shadowed
+
+        order = np.argsort(q_indices)
+        sorted_q = q_indices[order]
+        pos = np.minimum(np.searchsorted(sorted_q, indices), sorted_q.size - 1)
+        hit = sorted_q[pos] == indices
+        contributions = values[hit] * q_values[order][pos[hit]]
+        scores += np.bincount(owners[hit], weights=contributions, minlength=len(ids)).astype(np.float32)
+        return ids, scores, shadowed
+
+    def _scores(self, q_indices: np.ndarray, q_values: np.ndarray) -> np.ndarray:
+        """Dot product of the query against every row, via the inverted index."""
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        if q_indices.size == 0 or self._items.size == 0:
+            return scores
+
+        pos = np.searchsorted(self._items, q_indices)
+        pos = np.minimum(pos, self._items.size - 1)
+        hit = self._items[pos] == q_indices
+        pos, weights = pos[hit], q_values[hit]
+        if pos.size == 0:
+            return scores
+
+        # Gather the posting lists of every query item without a Python loop
+        starts = self._item_indptr[pos]
+        lengths = self._item_indptr[pos + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+
+        rows = self._item_rows[offsets]
+        contributions = self._item_values[offsets] * np.repeat(weights, lengths)
+        return np.bincount(rows, weights=contributions, minlength=len(self._ids)).astype(np.float32)
+
+    def _rebuild(self):
+        """Fold pending writes into the CSR / inverted index arrays."""
+        if not self._pending:
+            return
+        with self._lock:
+            if not self._pending:
+                return
+            rows = {
+                point_id: (self._indices[self._indptr[row]:self._indptr[row + 1]],
+                           self._values[self._indptr[row]:self._indptr[row + 1]])
+                for point_id, row in self._row_by_id.items()
+            }
+            rows.update(self._pending)
+            self._ids = list(rows)
+            self._row_by_id = {point_id: row for row, point_id in enumerate(self._ids)}
+            self._set_arrays(*self._build_arrays(list(rows.values())))
+            self._pending = {}
+            self._pending_index = None
+
+    @staticmethod
+    def _build_arrays(rows: List[Tuple[np.ndarray, np.ndarray]]):
+        lengths = np.fromiter((len(indices) for indices, _ in rows), dtype=np.int64, count=len(rows))
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.concatenate([r[0] for r in rows]).astype(np.int32) if rows else np.zeros(0, np.int32)
+        values = np.concatenate([r[1] for r in rows]).astype(np.float32) if rows else np.zeros(0, np.float32)
+
+        # Inverted index: sort entries by item, keep the owning row of each
+        row_of_entry = np.repeat(np.arange(len(rows), dtype=np.int32), lengths)
+        order = np.argsort(indices, kind="stable")
+        items, counts = np.unique(indices[order], return_counts=True)
+        item_indptr = np.zeros(items.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=item_indptr[1:])
+
+        return indptr, indices, values, items, item_indptr, row_of_entry[order], values[order]
+
+    def _set_arrays(self, indptr, indices, values, items, item_indptr, item_rows, item_values):
+        self._indptr = indptr
+        self._indices = indices
+        self._values = values
+        self._items = items
+        self._item_indptr = item_indptr
+        self._item_rows = item_rows
+        self._item_values = item_values
+
+
+if __name__ == "__main__":
+    # Snapshot the Qdrant collection into a memory-mappable directory:
+    #   python -m src.vectorstore.memory /path/to/store
+    import sys
+    from src.vectorstore.store import SparseClient
+
+    target = sys.argv[1]
+    snapshot = InMemorySparseStore.from_store(SparseClient())
+    snapshot.save(target)
+    print(f"Saved {len(snapshot)} points to {target}")
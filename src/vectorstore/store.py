@@ -1,26 +1,47 @@
 import os
+import threading
 import uuid
-from typing import List, Dict, Any, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait as futures_wait
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient, models
 from qdrant_client.http import models as rest_models
+from src.vectorstore.base import BatchFailure, BulkUpsertReport, VectorStore
+from src.vectorstore.connection import qdrant_client_kwargs
+from src.vectorstore.maintenance import VectorMaintenance
+from src.vectorstore.vector import SparsePoint, as_list
 
-class SparseClient:
-    def __init__(self):
-        # Load environment variables
-        load_dotenv()
-        qdrant_url = os.getenv('QDRANT_URL')
-        api_key = os.getenv('QDRANT_API_KEY')
+load_dotenv()
+
+
+class SparseClient(VectorStore):
+    def __init__(self, client: Optional[QdrantClient] = None, maintenance: Optional[VectorMaintenance] = None):
+        """
+        Wrap a Qdrant collection holding user sparse vectors.
+
+        Args:
+            client: Optional pre-built QdrantClient to share. When omitted a new
+                client is created from the environment (QDRANT_URL, QDRANT_TRANSPORT,
+                timeouts, pooling and retries; see `qdrant_client_kwargs`).
+            maintenance: Optional decay / pruning applied to every upserted
+                vector (as the activity updater does), so stored vectors never
+                exceed its `max_entries`; payload 'updated_at' is set to the
+                write time.
+        """
         self.sparse_name = os.getenv('QDRANT_SPARSE_NAME', 'sparse')
         self.collection_name = os.getenv('QDRANT_COLLECTION_NAME', 'sparse_collection')
+        # Dump raw Qdrant responses (costly for large vectors)
+        self.debug = os.getenv('QDRANT_DEBUG', 'False') == 'True'
 
-        if not qdrant_url:
-            raise ValueError("QDRANT_URL must be set in environment")
+        if client is None:
+            client = QdrantClient(**qdrant_client_kwargs())
+        self.client = client
+        self.maintenance = maintenance
 
-        # Initialize Qdrant client
-        self.client = QdrantClient(url=qdrant_url, api_key=api_key)
+        self.ensure_collection()
 
-        # Check or create collection
+    def ensure_collection(self):
+        """Check or create the sparse collection."""
         if not self.client.collection_exists(collection_name=self.collection_name):
             self.client.create_collection(
                 collection_name=self.collection_name,
@@ -49,9 +70,12 @@ class SparseClient:
             raise ValueError("Indices and values must have the same length")
 
         point_id = point_id or str(uuid.uuid4())
+        if self.maintenance is not None:
+            point = self.maintenance.apply({"id": point_id, "indices": indices, "values": values, "payload": payload})
+            indices, values, payload = point["indices"], point["values"], point["payload"]
         point = rest_models.PointStruct(
             id=point_id,
-            vector={self.sparse_name: rest_models.SparseVector(indices=indices, values=values)},
+            vector={self.sparse_name: rest_models.SparseVector(indices=as_list(indices), values=as_list(values))},
             payload=payload
         )
         self.client.upsert(collection_name=self.collection_name, points=[point])
@@ -62,39 +86,115 @@ class SparseClient:
     # -----------------------------
     def insert_sparse_points_bulk(
         self,
-        vectors: List[Dict[str, Any]]
-    ) -> List[str]:
+        vectors: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+        collect_ids: bool = False,
+        max_workers: int = 1,
+        wait: bool = True,
+        on_progress: Optional[Callable[[BulkUpsertReport], None]] = None
+    ) -> BulkUpsertReport:
         """
-        Bulk insert sparse points.
+        Bulk insert sparse points from any iterable (lists or generators).
         Each dict in `vectors` must have:
           - 'indices': List[int]
           - 'values': List[float]
           - optional 'payload': Dict
           - optional 'id': str
+
+        Points are sent in upserts of `batch_size`, with up to `max_workers`
+        batches in flight. Only a bounded window of batches is held in memory,
+        so a full reindex runs in constant memory unless `collect_ids` is set.
+
+        Args:
+            wait: Wait for Qdrant to apply each batch before acknowledging it.
+            on_progress: Called with the running report after every batch.
+
+        Returns:
+            BulkUpsertReport; a failed batch is recorded there and does not
+            stop the remaining ones. Malformed rows are recorded as a
+            separate failure of the batch they fell in.
         """
-        points = []
-        point_ids = []
+        report = BulkUpsertReport()
+        lock = threading.Lock()
+
+        def send(batch_index: int, points: List[rest_models.PointStruct], rejected: List[Tuple[List[str], str]]):
+            ids = [str(point.id) for point in points]
+            failure = None
+            if points:
+                try:
+                    self.client.upsert(collection_name=self.collection_name, points=points, wait=wait)
+                except Exception as e:
+                    failure = BatchFailure(batch_index=batch_index, point_ids=ids, error=str(e))
+
+            with lock:
+                report.batches += 1
+                if failure is None:
+                    report.inserted += len(points)
+                    if collect_ids:
+                        report.point_ids.extend(ids)
+                else:
+                    print(f"Bulk upsert batch {batch_index} failed: {failure.error}")
+                    report.failed.append(failure)
+                for point_ids, error in rejected:
+                    print(f"Bulk upsert batch {batch_index} rejected {point_ids}: {error}")
+                    report.failed.append(BatchFailure(batch_index=batch_index, point_ids=point_ids, error=error))
+                if on_progress is not None:
+                    on_progress(report)
+
+        batches = self._point_batches(vectors, batch_size)
+        if max_workers <= 1:
+            for batch_index, (points, rejected) in enumerate(batches):
+                send(batch_index, points, rejected)
+            return report
 
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qdrant-upsert") as pool:
+            in_flight = set()
+            for batch_index, (points, rejected) in enumerate(batches):
+                if len(in_flight) >= 2 * max_workers:
+                    _, in_flight = futures_wait(in_flight, return_when=FIRST_COMPLETED)
+                in_flight.add(pool.submit(send, batch_index, points, rejected))
+            futures_wait(in_flight)
+
+        return report
+
+    def _point_batches(
+        self,
+        vectors: Iterable[Dict[str, Any]],
+        batch_size: int
+    ) -> Iterator[Tuple[List[rest_models.PointStruct], List[Tuple[List[str], str]]]]:
+        """
+        Yield (points, rejected) per batch, rejected being ([point_id], error)
+        for each malformed row; a malformed row never stops the stream.
+        """
+        batch = []
+        rejected = []
         for vec in vectors:
-            indices = vec['indices']
-            values = vec['values']
-            payload = vec.get('payload')
-            point_id = vec.get('id', str(uuid.uuid4()))
-            point_ids.append(point_id)
-
-            if len(indices) != len(values):
-                raise ValueError("Indices and values must have the same length")
-
-            points.append(
-                rest_models.PointStruct(
-                    id=point_id,
-                    vector={self.sparse_name: rest_models.SparseVector(indices=indices, values=values)},
-                    payload=payload
-                )
-            )
+            try:
+                batch.append(self._to_point_struct(vec))
+            except Exception as e:
+                point_id = vec.get('id') if isinstance(vec, dict) else None
+                rejected.append(([str(point_id)] if point_id is not None else [], f"Malformed point: {e}"))
+            if len(batch) >= batch_size:
+                yield batch, rejected
+                batch = []
+                rejected = []
+        if batch or rejected:
+            yield batch, rejected
 
-        self.client.upsert(collection_name=self.collection_name, points=points)
-        return point_ids
+    def _to_point_struct(self, vec: Dict[str, Any]) -> rest_models.PointStruct:
+        indices = vec['indices']
+        values = vec['values']
+        if len(indices) != len(values):
+            raise ValueError("Indices and values must have the same length")
+        if self.maintenance is not None:
+            vec = self.maintenance.apply(vec)
+            indices, values = vec['indices'], vec['values']
+
+        return rest_models.PointStruct(
+            id=vec['id'] if vec.get('id') is not None else str(uuid.uuid4()),
+            vector={self.sparse_name: rest_models.SparseVector(indices=as_list(indices), values=as_list(values))},
+            payload=vec.get('payload')
+        )
 
     # -----------------------------
     # Get a point by its ID
@@ -104,32 +204,23 @@ class SparseClient:
         point_id: str,
         with_payload: bool = True,
         with_vector: bool = True
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[SparsePoint]:
         """
         Retrieve a point by its ID, including sparse vector content.
 
         Returns:
-            dict with:
-                - 'id'
-                - 'payload'
-                - 'sparse_vector': {'indices': [...], 'values': [...]}
+            SparsePoint with 'id', 'indices' and 'values', or None when the
+            point does not exist. Transport and server errors are raised so
+            callers never mistake an outage for a missing point.
         """
-        try:
-            point = self.client.retrieve(
-                collection_name=self.collection_name,
-                ids=[point_id],
-                with_vectors=with_vector
-            )
-
-            return {
-                "id": point[0].id,
-                "indices": point[0].vector['sparse'].indices,
-                "values": point[0].vector['sparse'].values
-            }
-        
-        except Exception as e:
-            print(f"Error retrieving point with ID {point_id}: {e}")
+        point = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[point_id],
+            with_vectors=with_vector
+        )
+        if not point:
             return None
+        return self._to_sparse_point(point[0])
 
     # -----------------------------
     # Search similar points by a reference point ID
@@ -138,7 +229,7 @@ class SparseClient:
         self,
         point_id: str,
         top_k: int = 5,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SparsePoint]:
         """
         Search for points similar to a given point ID.
 
@@ -153,13 +244,184 @@ class SparseClient:
             limit=top_k,
             with_vectors=True
         )
-        print(f"Response: {response}")
-        results = []
-        for hit in response.points:
-            results.append({
-                "id": hit.id,
-                "indices": hit.vector['sparse'].indices,
-                "values": hit.vector['sparse'].values
-            })
+        if self.debug:
+            print(f"Response: {response}")
+        return [self._to_sparse_point(hit) for hit in response.points]
+
+    # -----------------------------
+    # Search similar points by a sparse vector
+    # -----------------------------
+    def search_similar_by_vector(
+        self,
+        indices: List[int],
+        values: List[float],
+        top_k: int = 5,
+        exclude_id: Optional[str] = None,
+    ) -> List[SparsePoint]:
+        """
+        Search for points similar to an already-fetched sparse vector.
+        Unlike an ID query, Qdrant does not need to look the vector up first.
+
+        Args:
+            exclude_id: Point ID to leave out of the results (the query's owner).
+        """
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            using=self.sparse_name,
+            query=rest_models.SparseVector(indices=as_list(indices), values=as_list(values)),
+            query_filter=self._exclude_filter(exclude_id),
+            limit=top_k,
+            with_vectors=True
+        )
+        return [self._to_sparse_point(hit) for hit in response.points]
+
+    # -----------------------------
+    # Batch retrieve points by IDs
+    # -----------------------------
+    def get_points_by_ids(
+        self,
+        point_ids: List[str],
+        with_payload: bool = False
+    ) -> Dict[str, SparsePoint]:
+        """
+        Retrieve many points in a single round trip.
+
+        Returns:
+            dict mapping each found point ID (as str) to
+            {'id', 'indices', 'values'} (plus 'payload' when requested).
+            Missing IDs are absent.
+        """
+        if not point_ids:
+            return {}
 
+        points = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(point_ids),
+            with_payload=with_payload,
+            with_vectors=True
+        )
+        results = {}
+        for point in points:
+            item = self._to_sparse_point(point)
+            if with_payload:
+                item["payload"] = point.payload
+            results[str(point.id)] = item
         return results
+
+    # -----------------------------
+    # Scroll through every point
+    # -----------------------------
+    def scroll_points(
+        self,
+        page_size: int = 256,
+        with_payload: bool = False
+    ) -> Iterator[List[SparsePoint]]:
+        """
+        Walk the whole collection page by page.
+
+        Yields:
+            Lists of {'id', 'indices', 'values'} (plus 'payload' when requested).
+        """
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=True
+            )
+            page = []
+            for point in points:
+                item = self._to_sparse_point(point)
+                if with_payload:
+                    item["payload"] = point.payload
+                page.append(item)
+            if page:
+                yield page
+            if offset is None:
+                break
+
+    # -----------------------------
+    # Batch search similar points by reference IDs
+    # -----------------------------
+    def search_similar_batch(
+        self,
+        point_ids: List[str],
+        top_k: int = 5,
+    ) -> List[List[SparsePoint]]:
+        """
+        Search neighbours for many reference point IDs in a single round trip.
+        Every ID must exist in the collection.
+
+        Returns:
+            One list of {'id', 'indices', 'values'} per input ID, in order.
+        """
+        if not point_ids:
+            return []
+
+        requests = [
+            rest_models.QueryRequest(
+                query=point_id,
+                using=self.sparse_name,
+                limit=top_k,
+                with_vector=True
+            )
+            for point_id in point_ids
+        ]
+        return self._query_batch(requests)
+
+    # -----------------------------
+    # Batch search similar points by sparse vectors
+    # -----------------------------
+    def search_similar_by_vectors_batch(
+        self,
+        points: List[Dict[str, Any]],
+        top_k: int = 5,
+    ) -> List[List[SparsePoint]]:
+        """
+        Search neighbours for many already-fetched points in a single round trip.
+        Each point is a dict with 'id', 'indices' and 'values'; its own ID is
+        excluded from its results.
+
+        Returns:
+            One list of {'id', 'indices', 'values'} per input point, in order.
+        """
+        if not points:
+            return []
+
+        requests = [
+            rest_models.QueryRequest(
+                query=rest_models.SparseVector(indices=as_list(point["indices"]), values=as_list(point["values"])),
+                using=self.sparse_name,
+                filter=self._exclude_filter(point.get("id")),
+                limit=top_k,
+                with_vector=True
+            )
+            for point in points
+        ]
+        return self._query_batch(requests)
+
+    def _query_batch(self, requests) -> List[List[SparsePoint]]:
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        return [
+            [self._to_sparse_point(hit) for hit in response.points]
+            for response in responses
+        ]
+
+    @staticmethod
+    def _exclude_filter(point_id: Optional[str]) -> Optional[rest_models.Filter]:
+        return exclude_filter(point_id)
+
+    def _to_sparse_point(self, point) -> SparsePoint:
+        return SparsePoint.from_qdrant(point, self.sparse_name)
+
+
+def exclude_filter(point_id: Optional[str]) -> Optional[rest_models.Filter]:
+    """Qdrant filter leaving `point_id` out of query results (None when there is nothing to exclude)."""
+    if point_id is None:
+        return None
+    return rest_models.Filter(must_not=[rest_models.HasIdCondition(has_id=[point_id])])
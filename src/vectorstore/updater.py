@@ -0,0 +1,202 @@
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Set, Tuple
+from src.vectorstore.base import VectorStore
+from src.vectorstore.maintenance import VectorMaintenance
+
+# Interaction weight added to a user's vector per event type
+DEFAULT_ACTIVITY_WEIGHTS = {
+    "VIEW": 1.0,
+    "ADD_TO_CART": 3.0,
+    "ORDER": 5.0,
+}
+
+# Applied activity IDs remembered per user (in the point payload) to drop redeliveries
+APPLIED_ACTIVITY_HISTORY = 256
+
+
+@dataclass
+class ApplyResult:
+    """Outcome of `ActivityVectorUpdater.apply`."""
+    written: int = 0
+    # Users whose vector could not be written; their activities must be redelivered
+    failed_users: Set[str] = field(default_factory=set)
+
+
+class ActivityVectorUpdater:
+    """
+    Folds user activity events into the user sparse vectors.
+
+    Events of a micro-batch are merged per user first, so each changed user
+    costs one vector read (batched) and one write (chunked bulk upsert).
+    With `maintenance`, existing weights are decayed before the new events are
+    added and the result is pruned, so vectors stay bounded online.
+
+    Delivery is at least once: the IDs of the last APPLIED_ACTIVITY_HISTORY
+    activities are stored with each vector in the same write, and activities
+    already recorded there are skipped. Updates to one user are a
+    read-modify-write, so they must not run concurrently; publish to a FIFO
+    topic/queue (MessageGroupId = user_id) or run a single consumer. Other
+    read-modify-write passes (VectorMaintenance.compact) are kept out with
+    `lock`, held from the vector read to the write of each batch.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        weights: Optional[Dict[str, float]] = None,
+        chunk_size: int = 256,
+        maintenance: Optional[VectorMaintenance] = None,
+        on_written: Optional[Callable[[List[str]], Any]] = None,
+        lock: Optional[Callable[[], ContextManager]] = None
+    ):
+        """
+        Args:
+            store: Vector store holding one point per user (point ID = user_id).
+            weights: Weight per activity type; other types are ignored.
+            chunk_size: Points per upsert call.
+            maintenance: Optional decay / pruning policy.
+            on_written: Called with the user IDs whose vectors were written,
+                e.g. to invalidate cached recommendations. Errors are logged.
+            lock: Factory of the context manager shared with compaction
+                (e.g. app.services.vector_lock.vector_write_lock).
+        """
+        self.store = store
+        self.weights = weights or DEFAULT_ACTIVITY_WEIGHTS
+        self.chunk_size = chunk_size
+        self.maintenance = maintenance
+        self.on_written = on_written
+        self.lock = lock
+
+    def group(self, activities: Iterable[Dict[str, Any]]) -> Dict[str, Dict[Optional[str], Tuple[int, float]]]:
+        """
+        Weighted events per user, keyed by activity_id (duplicates within the
+        batch collapse). Events without an activity_id cannot be deduplicated
+        and are kept as they are.
+        """
+        events: Dict[str, Dict[Any, Tuple[int, float]]] = defaultdict(dict)
+        for activity in activities:
+            weight = self.weights.get(activity.get("activity_type"))
+            user_id = activity.get("user_id")
+            product_id = activity.get("product_id")
+            if weight is None or not user_id or product_id in (None, ""):
+                continue
+            try:
+                product_id = int(product_id)
+            except (TypeError, ValueError):
+                continue
+            user_events = events[str(user_id)]
+            user_events[activity.get("activity_id") or (None, len(user_events))] = (product_id, weight)
+        return events
+
+    def merge(self, activities: Iterable[Dict[str, Any]]) -> Dict[str, Dict[int, float]]:
+        """Sum event weights per (user, product)."""
+        deltas: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        for user_id, user_events in self.group(activities).items():
+            for product_id, weight in user_events.values():
+                deltas[user_id][product_id] += weight
+        return deltas
+
+    def apply(self, activities: Iterable[Dict[str, Any]]) -> ApplyResult:
+        """
+        Merge a micro-batch of activities into the stored vectors, skipping
+        activities already applied. Vector store read errors are raised;
+        failed writes are reported per user in the result.
+        """
+        result = ApplyResult()
+        events = self.group(activities)
+        if not events:
+            return result
+
+        with self.lock() if self.lock is not None else nullcontext():
+            report, points = self._write(events)
+        if report is None:
+            return result
+
+        for failure in report.failed:
+            result.failed_users.update(str(point_id) for point_id in failure.point_ids)
+        written = [point["id"] for point in points if point["id"] not in result.failed_users]
+        result.written = len(written)
+        if written and self.on_written is not None:
+            try:
+                self.on_written(written)
+            except Exception as e:
+                # The vectors are stored; cached recommendations expire with their TTL
+                print(f"on_written callback failed: {e}")
+        return result
+
+    def _write(self, events):
+        """Read, update and write back the vectors of `events`; returns (report or None, points)."""
+        existing = self.store.get_points_by_ids(list(events), with_payload=True)
+        now = datetime.utcnow()
+        updated_at = now.isoformat()
+
+        points = []
+        for user_id, user_events in events.items():
+            current = existing.get(user_id)
+            vector: Dict[int, float] = defaultdict(float)
+            payload: Dict[str, Any] = {}
+            applied = []
+            if current is not None:
+                payload = dict(current.get("payload") or {})
+                applied = list(payload.get("activity_ids") or [])
+                values = current["values"]
+                if self.maintenance is not None:
+                    values = self.maintenance.decay(values, payload.get("updated_at"), now)
+                vector.update(zip((int(i) for i in current["indices"]), (float(v) for v in values)))
+
+            seen = set(applied)
+            new_ids = [key for key in user_events if isinstance(key, str) and key not in seen]
+            fresh = [event for key, event in user_events.items() if not isinstance(key, str) or key not in seen]
+            if not fresh:
+                continue
+            for product_id, weight in fresh:
+                vector[product_id] += weight
+
+            indices, values = list(vector.keys()), list(vector.values())
+            if self.maintenance is not None:
+                indices, values = self.maintenance.prune(indices, values)
+
+            payload["updated_at"] = updated_at
+            payload["activity_ids"] = (applied + new_ids)[-APPLIED_ACTIVITY_HISTORY:]
+            points.append({
+                "id": user_id,
+                "indices": indices,
+                "values": values,
+                "payload": payload,
+            })
+
+        if not points:
+            return None, points
+        return self.store.insert_sparse_points_bulk(points, batch_size=self.chunk_size), points
+
+    def run(self, source, batch_size: int = 100, wait_seconds: int = 1, max_batches: Optional[int] = None):
+        """
+        Consume `source` (SQSActivitySource or a stand-in) in micro-batches.
+        Messages are acknowledged only after their user's vector has been
+        written; the rest become visible again and are retried.
+        """
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            messages = source.receive(max_messages=batch_size, wait_seconds=wait_seconds)
+            batches += 1
+            if not messages:
+                continue
+
+            started = time.perf_counter()
+            try:
+                result = self.apply(activity for _, activity in messages)
+            except Exception as e:
+                print(f"Activity batch failed, leaving it for redelivery: {e}")
+                continue
+            source.acknowledge(
+                handle for handle, activity in messages
+                if str(activity.get("user_id")) not in result.failed_users
+            )
+            print(
+                f"Applied {len(messages)} activities to {result.written} user vectors "
+                f"({len(result.failed_users)} failed) in {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
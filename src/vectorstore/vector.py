@@ -0,0 +1,67 @@
+from typing import Any, Dict, Optional
+import numpy as np
+
+
+def as_list(values) -> list:
+    """Plain Python list for APIs that validate element types (e.g. Qdrant models)."""
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+class SparsePoint:
+    """
+    Compact sparse vector result.
+
+    Indices and values are contiguous int32 / float32 arrays (views, not
+    copies, when they already have that dtype), so aggregation can
+    concatenate them directly. Supports the dict-style access
+    (`point["indices"]`, `point.get("payload")`) used across the codebase.
+    """
+
+    __slots__ = ("id", "indices", "values", "payload")
+
+    def __init__(self, id: Any, indices, values, payload: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.payload = payload
+
+    @classmethod
+    def from_qdrant(cls, point, sparse_name: str) -> "SparsePoint":
+        """Build from a Qdrant Record / ScoredPoint retrieved with vectors."""
+        vector = point.vector[sparse_name]
+        return cls(point.id, vector.indices, vector.values)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __len__(self) -> int:
+        return int(self.indices.size)
+
+    def __bool__(self) -> bool:
+        # A stored point with an empty vector (e.g. fully pruned) still exists
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "indices": self.indices.tolist(),
+            "values": self.values.tolist(),
+            "payload": self.payload
+        }
+
+    def __repr__(self) -> str:
+        return f"SparsePoint(id={self.id!r}, nnz={len(self)})"
@@ -0,0 +1,111 @@
+"""
+InMemorySparseStore against a brute-force dot-product reference, through
+pending writes, rebuilds and a save/load round trip. Runs offline.
+"""
+import numpy as np
+import pytest
+from src.vectorstore.memory import InMemorySparseStore
+
+ITEMS = 300
+
+
+def random_vector(rng):
+    size = int(rng.integers(1, 20))
+    indices = rng.choice(ITEMS, size=size, replace=False)
+    return indices.tolist(), rng.random(size).astype(np.float32).tolist()
+
+
+def dot(a, b):
+    return sum(value * b.get(index, 0.0) for index, value in a.items())
+
+
+def assert_matches(store, reference, rng, queries=50, top_k=10):
+    assert len(store) == len(reference)
+    scrolled = [point["id"] for page in store.scroll_points(page_size=97) for point in page]
+    assert sorted(scrolled) == sorted(reference)
+
+    for point_id in rng.choice(sorted(reference), size=min(queries, len(reference)), replace=False):
+        point = store.get_point_by_id(point_id)
+        assert dict(zip(point["indices"].tolist(), point["values"].tolist())) == reference[point_id]
+
+        expected = sorted(
+            (dot(reference[point_id], vector) for other, vector in reference.items() if other != point_id),
+            reverse=True
+        )
+        expected = [score for score in expected if score > 0][:top_k]
+        results = store.search_similar_by_id(point_id, top_k=top_k)
+        assert point_id not in [result["id"] for result in results]
+        # Ties may come back in any order, so compare the scores, recomputed from the reference
+        scores = [dot(reference[point_id], reference[result["id"]]) for result in results]
+        assert scores == pytest.approx(expected, rel=1e-4)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_matches_reference_across_pending_writes_and_rebuilds(rng):
+    # Small max_pending so the writes cross several rebuilds
+    store = InMemorySparseStore(max_pending=64)
+    reference = {}
+    for n in range(2000):
+        # Every third write replaces an existing point
+        point_id = str(rng.integers(0, n)) if n and n % 3 == 0 else str(n)
+        indices, values = random_vector(rng)
+        store.insert_sparse_point(indices, values, point_id=point_id)
+        reference[point_id] = dict(zip(indices, values))
+        if n % 500 == 250:
+            assert_matches(store, reference, rng)
+    assert_matches(store, reference, rng)
+
+
+def test_save_and_load_round_trip(rng, tmp_path):
+    store = InMemorySparseStore(max_pending=64)
+    reference = {}
+    for n in range(300):
+        indices, values = random_vector(rng)
+        store.insert_sparse_point(indices, values, point_id=str(n))
+        reference[str(n)] = dict(zip(indices, values))
+
+    store.save(str(tmp_path))
+    assert_matches(InMemorySparseStore.load(str(tmp_path)), reference, rng)
+
+
+def test_integer_id_zero_is_kept():
+    store = InMemorySparseStore()
+    report = store.insert_sparse_points_bulk([{"id": 0, "indices": [1], "values": [1.0]}], collect_ids=True)
+    assert report.point_ids == ["0"]
+    assert store.get_point_by_id(0) is not None
+
+
+def test_missing_id_gets_a_generated_one():
+    store = InMemorySparseStore()
+    point_id = store.insert_sparse_point([1], [1.0])
+    assert store.get_point_by_id(point_id)["id"] == point_id
+
+
+def test_search_excludes_a_pending_point():
+    store = InMemorySparseStore.from_points([{"id": "a", "indices": [1], "values": [1.0]}])
+    store.insert_sparse_point([1], [2.0], point_id="b")
+    assert [point["id"] for point in store.search_similar_by_vector([1], [1.0], exclude_id="b")] == ["a"]
+    assert [point["id"] for point in store.search_similar_by_id("a")] == ["b"]
+
+
+def test_scroll_points_reads_a_snapshot():
+    store = InMemorySparseStore.from_points(
+        {"id": str(n), "indices": [n], "values": [1.0]} for n in range(10)
+    )
+    pages = store.scroll_points(page_size=4)
+    first = next(pages)
+    store.insert_sparse_point([99], [1.0], point_id="new")
+    rest = [point["id"] for page in pages for point in page]
+    assert sorted([point["id"] for point in first] + rest) == [str(n) for n in range(10)]
+
+
+def test_recommender_keeps_an_empty_store():
+    # An empty store has len() == 0; it must still be used rather than replaced by a Qdrant client
+    from src.recommender.recommender import SparseRecommender
+
+    store = InMemorySparseStore()
+    assert SparseRecommender(client=store).client is store